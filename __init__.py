@@ -1,34 +1,30 @@
+import time
+from functools import partial
 from typing import Any, Optional
 
+# === Import Timing ===
+# Covers everything below; the initial theme application runs later, once the main window is up.
+IMPORT_BUDGET_MS = 250
+import_started = time.perf_counter()
+
 # === Startup Side Effects ===
-from .utils import dialog
+# Adds the menu entries and schedules the saved theme; the config UI itself loads on first use.
+from .utils import theme_apply
 
 # === Core Utilities ===
-from .utils.css_files import css_files_dir
+from .utils.capabilities import capabilities
+from .utils.css_files import css_files_dir, get_qss
+from .utils.custom_css import build_custom_css, custom_css_cache
+from .utils.leak_check import leak_check_parent, register_leak_check_cache, register_leak_check_step
 from .utils.logger import logger
 from .utils.modules import *
-from .utils.themes import get_theme, normalize_theme_name
+from .utils.perf import perf
+from .utils.style_injector import attach_stylesheet, inject_stylesheet
+from .utils.styled_registry import register_styled
 
 # === Anki/Qt Imports ===
-from aqt import AnkiQt, DialogManager, QWidget, gui_hooks, mw
-from aqt.theme import theme_manager
-
-# === Dialog Windows ===
-if module_exists("aqt.browser.browser"):
-    from aqt.browser.browser import Browser
-else:
-    from aqt.browser import Browser
-if module_has_attribute("aqt.stats", "NewDeckStats"):
-    from aqt.stats import DeckStats, NewDeckStats
-else:
-    from aqt.stats import DeckStats
-from aqt.addcards import AddCards
-from aqt.editcurrent import EditCurrent
-from aqt.about import ClosableQDialog
-from aqt.preferences import Preferences
-from aqt.addons import AddonsDialog
-if module_exists("aqt.filtered_deck"):
-    from aqt.filtered_deck import FilteredDeckConfigDialog
+from aqt import QWidget, gui_hooks, mw
+from aqt.qt import QDialog
 
 # === Webview Contexts ===
 from aqt.toolbar import TopToolbar
@@ -38,31 +34,16 @@ from aqt.editor import Editor
 from aqt.reviewer import Reviewer, ReviewerBottomBar
 from aqt.webview import WebContent
 
-from anki.utils import pointVersion
-
 # === Styling Injections ===
+from .injections.bottom_bar import request_bottom_bar_height_sync
 from .injections.toolbar import redraw_toolbar_legacy
 
 # === Config ===
 from .config import get_config
 
-# === Theme/Style State ===
+# === Startup Logging ===
 logger.debug(css_files_dir)
-LIGHT_COLOR_MODE = 2
-DARK_COLOR_MODE = 3
-
-
-def get_effective_color_mode() -> int:
-    return DARK_COLOR_MODE if theme_manager.get_night_mode() else LIGHT_COLOR_MODE
-
-
-def get_active_theme_name(config_data: dict) -> str:
-    return normalize_theme_name(config_data.get("theme_name", "Anki"))
-
-
-initial_config = get_config()
-themes_parsed = get_theme(get_active_theme_name(initial_config))
-color_mode = get_effective_color_mode()
+logger.debug(capabilities.dump())
 
 # === Title Bar Styling ===
 from .utils.dark_title_bar import set_dark_titlebar, set_dark_titlebar_qt, dwmapi
@@ -70,188 +51,184 @@ set_dark_titlebar(mw, dwmapi)
 logger.debug(dwmapi)
 
 # === CSS Injection Helpers ===
-def load_custom_style(include_typography: bool = True):
-    current_config = get_config()
-
-    theme_colors_light = ""
-    theme_colors_dark = ""
-    for color_name in themes_parsed.get("colors"):
-        color = themes_parsed.get("colors").get(color_name)
-        if color[-1]:
-            theme_colors_light += f"{color[-1]}: {color[LIGHT_COLOR_MODE]};\n        "
-            theme_colors_dark += f"{color[-1]}: {color[DARK_COLOR_MODE]};\n        "
-        else:
-            theme_colors_light += f"--{color_name.lower().replace('_','-')}: {color[LIGHT_COLOR_MODE]};\n        "
-            theme_colors_dark += f"--{color_name.lower().replace('_','-')}: {color[DARK_COLOR_MODE]};\n        "
-    typography_css = ""
-    if include_typography and current_config.get("font_customization_enabled", False):
-        font = current_config["font"]
-        if current_config["fallbackFonts"]:
-            font = f"{current_config['font']}, {current_config['fallbackFonts']}"
-        typography_css = """
-    html {
-        font-family: %s;
-        font-size: %spx !important;
-        --font-size: %spx !important;
-    }
-""" % (font, current_config["font_size"], current_config["font_size"])
-    custom_style = """
-<style>
-    /* Light */ 
-    :root,
-    :root .isMac,
-    :root .isWin,
-    :root .isLin {
-        %s
-    }
-    /* Dark */
-    :root body.nightMode,
-    :root body.isWin.nightMode,
-    :root body.isMac.nightMode,
-    :root body.isLin.nightMode {
-        %s
-    }
-%s
+def load_custom_style(include_typography: bool = True, context_key: Optional[str] = None):
+    return """
+<style>%s
 </style>
-    """ % (theme_colors_light, theme_colors_dark, typography_css)
-    return custom_style
+    """ % build_custom_css(include_typography, context_key)
+
+
+def get_style_context_key(context: Optional[Any]) -> Optional[str]:
+    if isinstance(context, TopToolbar):
+        return "TopToolbar"
+    if isinstance(context, (DeckBrowserBottomBar, OverviewBottomBar)):
+        return "BottomBar"
+    if isinstance(context, ReviewerBottomBar):
+        return "ReviewerBottomBar"
+    return None
+
+
+# === Live Restyling ===
+# Restylers for register_styled(); they take the styled object as their last argument.
+def restyle_webview(include_typography: bool, context_key: Optional[str], web) -> None:
+    inject_stylesheet(web, build_custom_css(include_typography, context_key))
 
 
-def load_custom_style_wrapper():
-    custom_style = f"""
-    const style = document.createElement("style");
-    style.innerHTML = `{load_custom_style()[8:-13]}`;
-    document.head.appendChild(style);
-    """
-    return custom_style
+def restyle_window(qss_name: str, window: QWidget) -> None:
+    window.setStyleSheet(get_qss(qss_name))
+
+
+def style_window(window: QWidget, qss_name: str) -> None:
+    restyle_window(qss_name, window)
+    register_styled(window, partial(restyle_window, qss_name))
+
+
+def get_context_web(context: Optional[Any]):
+    if isinstance(context, (DeckBrowserBottomBar, OverviewBottomBar, ReviewerBottomBar)):
+        return mw.bottomWeb
+    return getattr(context, "web", None)
+
 
 # === Webview Styling Hook ===
 def on_webview_will_set_content(web_content: WebContent, context: Optional[Any]) -> None:
-    logger.debug(context)
-    current_config = get_config()
-    is_card_rendering_context = (
-        isinstance(context, Reviewer)
-        or context_name_includes(context, "aqt.clayout.CardLayout")
-        or context_name_includes(context, "Previewer")
-    )
-    web_content.css.append(css_files_dir['global'])
-    web_content.head += load_custom_style(include_typography=not is_card_rendering_context)
-    if isinstance(context, DeckBrowser):
-        web_content.css.append(css_files_dir['DeckBrowser'])
-    elif isinstance(context, TopToolbar):
-        web_content.css.append(css_files_dir['TopToolbar'])
-    elif isinstance(context, DeckBrowserBottomBar) or isinstance(context, OverviewBottomBar):
-        web_content.css.append(css_files_dir['BottomBar'])
-    elif isinstance(context, Overview):
-        web_content.css.append(css_files_dir['Overview'])
-    elif isinstance(context, Editor):
-        web_content.css.append(css_files_dir['Editor'])
-    elif isinstance(context, Reviewer):
-        web_content.css.append(css_files_dir['Reviewer'])
-        if current_config.get("match_card_template_background_to_theme", True):
-            web_content.css.append(css_files_dir['ReviewerCardBackground'])
-    elif isinstance(context, ReviewerBottomBar):
-        web_content.css.append(css_files_dir['BottomBar'])
-        web_content.css.append(css_files_dir['ReviewerBottomBar'])
-        web_content.body += "<div style='height: 14px; opacity: 0; pointer-events: none;'></div>"
-        web_content.body += "<div id='padFix' style='height: 30px; opacity: 0; pointer-events: none;'><script>const e = document.getElementById('padFix');e.parentElement.removeChild(e);</script></div>"
-        if pointVersion() >= 56:
-            web_content.body = "<div class='new-qt6' style='display: none;'></div>"+web_content.body
-        mw.bottomWeb.adjustHeightToFit()
-    elif context_name_includes(context, "aqt.clayout.CardLayout"):
-        web_content.css.append(css_files_dir['CardLayout'])
-    elif context_name_includes(context, "aqt.main.ResetRequired"):
-        web_content.css.append(css_files_dir['legacy'])
+    with perf.measure(f"on_webview_will_set_content/{type(context).__name__}"):
+        logger.debug(context)
+        current_config = get_config()
+        is_card_rendering_context = (
+            isinstance(context, Reviewer)
+            or context_name_includes(context, "aqt.clayout.CardLayout")
+            or context_name_includes(context, "Previewer")
+        )
+        include_typography = not is_card_rendering_context
+        context_key = get_style_context_key(context)
+        web_content.css.append(css_files_dir['global'])
+        web_content.head += load_custom_style(include_typography, context_key)
+        web = get_context_web(context)
+        if web is not None:
+            register_styled(web, partial(restyle_webview, include_typography, context_key))
+        if isinstance(context, DeckBrowser):
+            web_content.css.append(css_files_dir['DeckBrowser'])
+        elif isinstance(context, TopToolbar):
+            web_content.css.append(css_files_dir['TopToolbar'])
+        elif isinstance(context, DeckBrowserBottomBar) or isinstance(context, OverviewBottomBar):
+            web_content.css.append(css_files_dir['BottomBar'])
+        elif isinstance(context, Overview):
+            web_content.css.append(css_files_dir['Overview'])
+        elif isinstance(context, Editor):
+            web_content.css.append(css_files_dir['Editor'])
+        elif isinstance(context, Reviewer):
+            web_content.css.append(css_files_dir['Reviewer'])
+            if current_config.get("match_card_template_background_to_theme", True):
+                web_content.css.append(css_files_dir['ReviewerCardBackground'])
+        elif isinstance(context, ReviewerBottomBar):
+            web_content.css.append(css_files_dir['BottomBar'])
+            web_content.css.append(css_files_dir['ReviewerBottomBar'])
+            if capabilities.modern_theme:
+                web_content.css.append(css_files_dir['ReviewerBottomBarModern'])
+            request_bottom_bar_height_sync()
+        elif context_name_includes(context, "aqt.clayout.CardLayout"):
+            web_content.css.append(css_files_dir['CardLayout'])
+        elif context_name_includes(context, "aqt.main.ResetRequired"):
+            web_content.css.append(css_files_dir['legacy'])
+        # Last, so that it overrides the context stylesheets; card content keeps its own effects.
+        if current_config.get("performance_mode", False) and not is_card_rendering_context:
+            web_content.css.append(css_files_dir['performance'])
 
 
 # === Hook Wiring ===
 gui_hooks.webview_will_set_content.append(on_webview_will_set_content)
 
-if attribute_exists(gui_hooks, "main_window_did_init"):
+if capabilities.has_main_window_did_init:
     pass
-elif attribute_exists(gui_hooks, "top_toolbar_did_init_links"):
-    gui_hooks.top_toolbar_did_init_links.append(redraw_toolbar_legacy)
+elif capabilities.has_top_toolbar_did_init_links:
+    append_hook_once(gui_hooks.top_toolbar_did_init_links, redraw_toolbar_legacy)
 
 # === Dialog Styling Hook ===
-def on_dialog_manager_did_open_dialog(dialog_manager: DialogManager, dialog_name: str, dialog_instance: QWidget) -> None:
+# Stylesheet for each DialogManager name. Dialogs are matched by name, so their
+# classes are never imported by the add-on.
+DIALOG_STYLESHEETS = {
+    "AddCards": "QAddCards",
+    "AddonsDialog": "QAddonsDialog",
+    "Browser": "QBrowser",
+    "EditCurrent": "QEditCurrent",
+    "FilteredDeckConfigDialog": "QFilteredDeckConfigDialog",
+    "NewDeckStats": "QNewDeckStats",
+    "About": "QAbout",
+    "Preferences": "QPreferences",
+}
+
+
+@perf.timed("on_dialog_manager_did_open_dialog")
+def on_dialog_manager_did_open_dialog(dialog_manager, dialog_name: str, dialog_instance: QWidget) -> None:
     logger.debug(dialog_name)
-    dialog: AnkiQt = dialog_manager._dialogs[dialog_name][1]
+    dialog = dialog_manager._dialogs[dialog_name][1]
     set_dark_titlebar_qt(dialog, dwmapi)
-    if dialog_name == "AddCards":
-        context: AddCards = dialog_manager._dialogs[dialog_name][1]
-        context.setStyleSheet(open(css_files_dir['QAddCards'], encoding='utf-8').read())
-    elif dialog_name == "AddonsDialog":
-        context: AddonsDialog = dialog_manager._dialogs[dialog_name][1]
-        context.setStyleSheet(open(css_files_dir['QAddonsDialog'], encoding='utf-8').read())
-    elif dialog_name == "Browser":
-        context: Browser = dialog_manager._dialogs[dialog_name][1]
-        context.setStyleSheet(open(css_files_dir['QBrowser'], encoding='utf-8').read())
-    elif dialog_name == "EditCurrent":
-        context: EditCurrent = dialog_manager._dialogs[dialog_name][1]
-        context.setStyleSheet(open(css_files_dir['QEditCurrent'], encoding='utf-8').read())
-    elif module_exists("aqt.filtered_deck") and dialog_name == "FilteredDeckConfigDialog":
-        context: FilteredDeckConfigDialog = dialog_manager._dialogs[dialog_name][1]
-        context.setStyleSheet(open(css_files_dir['QFilteredDeckConfigDialog'], encoding='utf-8').read())
-    elif dialog_name == "NewDeckStats":
-        context: NewDeckStats = dialog_manager._dialogs[dialog_name][1]
-        context.form.web.eval(load_custom_style_wrapper())
-        context.setStyleSheet(open(css_files_dir['QNewDeckStats'], encoding='utf-8').read())
-    elif dialog_name == "About":
-        context: ClosableQDialog = dialog_manager._dialogs[dialog_name][1]
-        context.setStyleSheet(open(css_files_dir['QAbout'], encoding='utf-8').read())
-    elif dialog_name == "Preferences":
-        context: Preferences = dialog_manager._dialogs[dialog_name][1]
-        context.setStyleSheet(open(css_files_dir['QPreferences'], encoding='utf-8').read())
-    elif dialog_name == "sync_log":
-        pass
-
-
-if attribute_exists(gui_hooks, "dialog_manager_did_open_dialog"):
+    if dialog_name == "NewDeckStats":
+        attach_stylesheet(dialog.form.web, build_custom_css)
+        register_styled(dialog.form.web, partial(restyle_webview, True, None))
+    qss_name = DIALOG_STYLESHEETS.get(dialog_name)
+    if qss_name:
+        style_window(dialog, qss_name)
+
+
+def leak_check_dialog_styling() -> None:
+    # Stands in for a styled dialog being opened and closed again.
+    window = QDialog(leak_check_parent())
+    style_window(window, 'QBrowser')
+    window.deleteLater()
+
+
+register_leak_check_step("dialog_styling", leak_check_dialog_styling)
+register_leak_check_cache("custom_css", lambda: custom_css_cache)
+
+if capabilities.has_dialog_manager_did_open_dialog:
     gui_hooks.dialog_manager_did_open_dialog.append(
         on_dialog_manager_did_open_dialog)
 else:
     # === Legacy Dialog Styling ===
+    # (module, class, stylesheet); classes are resolved when the first dialog opens.
+    LEGACY_DIALOG_STYLESHEETS = (
+        ("aqt.addcards", "AddCards", "QAddCards"),
+        ("aqt.editcurrent", "EditCurrent", "QEditCurrent"),
+        ("aqt.stats", "DeckStats", "QNewDeckStats"),
+        ("aqt.about", "ClosableQDialog", "QAbout"),
+    )
+
     def monkey_setup_dialog_gc(obj: Any) -> None:
         obj.finished.connect(lambda: mw.gcWindow(obj))
         logger.debug(obj)
         set_dark_titlebar_qt(obj, dwmapi)
-        if isinstance(obj, AddCards):
-            obj.setStyleSheet(open(css_files_dir['QAddCards'], encoding='utf-8').read())
-        elif isinstance(obj, EditCurrent):
-            obj.setStyleSheet(open(css_files_dir['QEditCurrent'], encoding='utf-8').read())
-        elif isinstance(obj, DeckStats):
-            obj.setStyleSheet(open(css_files_dir['QNewDeckStats'], encoding='utf-8').read())
-        elif isinstance(obj, ClosableQDialog):
-            obj.setStyleSheet(open(css_files_dir['QAbout'], encoding='utf-8').read())
+        for module_name, class_name, qss_name in LEGACY_DIALOG_STYLESHEETS:
+            dialog_class = resolve_attribute(module_name, class_name)
+            if dialog_class is not None and isinstance(obj, dialog_class):
+                style_window(obj, qss_name)
+                break
 
     mw.setupDialogGC = monkey_setup_dialog_gc
 
-    if attribute_exists(gui_hooks, "addons_dialog_will_show"):
-        def on_addons_dialog_will_show(dialog: AddonsDialog) -> None:
+    if capabilities.has_addons_dialog_will_show:
+        def on_addons_dialog_will_show(dialog: QWidget) -> None:
             logger.debug(dialog)
             set_dark_titlebar_qt(dialog, dwmapi)
-            dialog.setStyleSheet(open(css_files_dir['QAddonsDialog'], encoding='utf-8').read())
+            style_window(dialog, 'QAddonsDialog')
         gui_hooks.addons_dialog_will_show.append(on_addons_dialog_will_show)
-    if attribute_exists(gui_hooks, "browser_will_show"):
-        def on_browser_will_show(browser: Browser) -> None:
+    if capabilities.has_browser_will_show:
+        def on_browser_will_show(browser: QWidget) -> None:
             logger.debug(browser)
             set_dark_titlebar_qt(browser, dwmapi)
-            browser.setStyleSheet(open(css_files_dir['QBrowser'], encoding='utf-8').read())
+            style_window(browser, 'QBrowser')
         gui_hooks.browser_will_show.append(on_browser_will_show)
 
 # === Theme Change Wiring ===
-if attribute_exists(gui_hooks, "style_did_init"):
+if capabilities.has_style_did_init:
     def updateStyle(str):
         return str
     gui_hooks.style_did_init.append(updateStyle)
 
-def updateTheme(_):
-    logger.debug("updating theme")
-    global themes_parsed, color_mode
-    current_config = get_config()
-    themes_parsed = get_theme(get_active_theme_name(current_config))
-    color_mode = get_effective_color_mode()
-
-
-# Communication through script using rarely used hook (might change to custom hooks in the future)
-gui_hooks.debug_console_will_show.append(updateTheme)
+# === Import Budget ===
+import_ms = (time.perf_counter() - import_started) * 1000
+perf.record("addon_import", import_ms)
+perf.add_gauge("addon_import_ms", lambda: round(import_ms))
+perf.set_budget("addon_import_ms", IMPORT_BUDGET_MS)
+if import_ms > IMPORT_BUDGET_MS:
+    logger.debug(f"Add-on import took {import_ms:.0f} ms, over the {IMPORT_BUDGET_MS} ms budget")
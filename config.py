@@ -21,6 +21,7 @@ def get_config() -> dict:
         theme_name = DEFAULT_THEME_NAME
     elif theme_name.endswith(".json"):
         theme_name = theme_name[:-5]
+    deck_themes = raw.get("deck_themes", {})
     config = {
         "font": raw.get("font", "Arial"),
         "fallbackFonts": raw.get("fallbackFonts", "sans-serif"),
@@ -29,15 +30,18 @@ def get_config() -> dict:
             raw.get("match_card_template_background_to_theme", True), True
         ),
         "font_customization_enabled": _to_bool(raw.get("font_customization_enabled", False)),
-        "show_restart_notice": _to_bool(raw.get("show_restart_notice", True), True),
+        "live_preview": _to_bool(raw.get("live_preview", True), True),
+        "prewarm_enabled": _to_bool(raw.get("prewarm_enabled", True), True),
+        "performance_mode": _to_bool(raw.get("performance_mode", False)),
         "theme_name": theme_name.strip(),
+        "deck_themes": deck_themes if isinstance(deck_themes, dict) else {},
     }
     return config
 
 # === Config Persistence ===
 def write_config(config):
     for key in config.keys():
-        if not isinstance(config[key], str):
+        if not isinstance(config[key], (str, dict)):
             config[key] = str(config[key])
     mw.addonManager.writeConfig(__name__, config)
 
@@ -0,0 +1,27 @@
+from aqt import mw
+from aqt.qt import qconnect
+
+# === Reviewer Bottom Bar Sizing ===
+_load_finished_connected = False
+_height_sync_pending = False
+
+
+def _on_bottom_web_load_finished(_ok: bool = True) -> None:
+    global _height_sync_pending
+    if not _height_sync_pending:
+        return
+    _height_sync_pending = False
+    mw.bottomWeb.adjustHeightToFit()
+
+
+def request_bottom_bar_height_sync() -> None:
+    """Sync the bottom webview height once the reviewer bottom bar has loaded.
+
+    The bar's height is fixed by ReviewerBottomBar.css, so the per-card
+    question/answer transitions never need to renegotiate it.
+    """
+    global _load_finished_connected, _height_sync_pending
+    _height_sync_pending = True
+    if not _load_finished_connected:
+        qconnect(mw.bottomWeb.loadFinished, _on_bottom_web_load_finished)
+        _load_finished_connected = True
@@ -1,23 +1,43 @@
 from typing import List
 
 from aqt import mw
-from aqt.qt import QTimer
+from aqt.qt import QEvent, QObject
 from aqt.toolbar import Toolbar
 
 # === Toolbar Sizing ===
 TOOLBAR_HEIGHT = 45
 
-def _enforce_toolbar_height() -> None:
-    mw.toolbar.web.setFixedHeight(TOOLBAR_HEIGHT)
 
-# === Toolbar Redraw Helpers ===
-def redraw_toolbar() -> None:
-    _enforce_toolbar_height()
-    mw.toolbar.redraw()
-    QTimer.singleShot(0, _enforce_toolbar_height)
-    QTimer.singleShot(100, _enforce_toolbar_height)
+class ToolbarHeightFilter(QObject):
+    """Re-applies TOOLBAR_HEIGHT whenever the toolbar webview's geometry drifts."""
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if event.type() in (QEvent.Type.Resize, QEvent.Type.Show):
+            _enforce_toolbar_height(obj)
+        return False
+
+
+_toolbar_filter = None
+_filtered_web = None
+
 
+def _enforce_toolbar_height(web=None) -> None:
+    web = web or mw.toolbar.web
+    if web.height() != TOOLBAR_HEIGHT or web.maximumHeight() != TOOLBAR_HEIGHT:
+        web.setFixedHeight(TOOLBAR_HEIGHT)
+
+
+def install_toolbar_sizer() -> None:
+    global _toolbar_filter, _filtered_web
+    web = mw.toolbar.web
+    if _filtered_web is web:
+        return
+    if _toolbar_filter is None:
+        _toolbar_filter = ToolbarHeightFilter(mw)
+    web.installEventFilter(_toolbar_filter)
+    _filtered_web = web
+    _enforce_toolbar_height(web)
+
+# === Toolbar Redraw Helpers ===
 def redraw_toolbar_legacy(links: List[str], _: Toolbar) -> None:
-    _enforce_toolbar_height()
-    QTimer.singleShot(0, _enforce_toolbar_height)
-    QTimer.singleShot(100, _enforce_toolbar_height)
+    install_toolbar_sizer()
@@ -0,0 +1,77 @@
+import json
+
+from aqt import gui_hooks
+from aqt.qt import QPalette
+from aqt.theme import colors
+from anki.utils import pointVersion
+
+from .modules import attribute_exists, module_exists, module_has_attribute
+
+# Hooks the add-on branches on; each becomes a has_<name> flag.
+PROBED_HOOKS = (
+    "addons_dialog_will_show",
+    "browser_will_show",
+    "dialog_manager_did_open_dialog",
+    "main_window_did_init",
+    "state_will_change",
+    "style_did_init",
+    "theme_did_change",
+    "top_toolbar_did_init_links",
+)
+
+# Probes that have to import a module; each runs on first access instead of at load.
+MODULE_PROBES = {
+    "has_browser_package": lambda: module_exists("aqt.browser.browser"),
+    "has_new_deck_stats": lambda: module_has_attribute("aqt.stats", "NewDeckStats"),
+    "has_filtered_deck_dialog": lambda: module_exists("aqt.filtered_deck"),
+    "has_current_lang": lambda: module_has_attribute("anki.lang", "current_lang"),
+}
+
+
+# === Capability Probe ===
+class Capabilities:
+    """Anki/Qt feature flags, probed once at add-on load (module probes on first use)."""
+
+    def __init__(self) -> None:
+        self.anki_version = pointVersion()
+        self.qt6 = "Qt6" in QPalette.ColorRole.__module__
+        # Anki 2.1.56+ uses the CANVAS/FG palette and {"light", "dark"} color entries.
+        self.modern_theme = self.anki_version >= 56
+        self.legacy_colors = self._probe_legacy_colors()
+        if self.legacy_colors:
+            self.colors_api = "legacy_dict"
+        elif self.modern_theme:
+            self.colors_api = "light_dark"
+        else:
+            self.colors_api = "tuple"
+
+        for hook_name in PROBED_HOOKS:
+            setattr(self, f"has_{hook_name}", attribute_exists(gui_hooks, hook_name))
+
+    def __getattr__(self, name: str):
+        probe = MODULE_PROBES.get(name)
+        if probe is None:
+            raise AttributeError(name)
+        value = probe()
+        setattr(self, name, value)
+        return value
+
+    @staticmethod
+    def _probe_legacy_colors() -> bool:
+        try:
+            _ = colors.items()
+        except:
+            return False
+        return True
+
+    def as_dict(self) -> dict:
+        for name in MODULE_PROBES:
+            getattr(self, name)
+        return dict(vars(self))
+
+    def dump(self) -> str:
+        # Only what has been probed so far, so that logging does not trigger module probes.
+        return json.dumps(dict(vars(self)), indent=2, sort_keys=True)
+
+
+capabilities = Capabilities()
@@ -0,0 +1,183 @@
+import re
+from functools import lru_cache
+from typing import Optional
+
+LIGHT_COLOR_MODE = 2
+DARK_COLOR_MODE = 3
+
+# === CSS Named Colors ===
+NAMED_COLORS = {
+    "aliceblue": "f0f8ff", "antiquewhite": "faebd7", "aqua": "00ffff", "aquamarine": "7fffd4",
+    "azure": "f0ffff", "beige": "f5f5dc", "bisque": "ffe4c4", "black": "000000",
+    "blanchedalmond": "ffebcd", "blue": "0000ff", "blueviolet": "8a2be2", "brown": "a52a2a",
+    "burlywood": "deb887", "cadetblue": "5f9ea0", "chartreuse": "7fff00", "chocolate": "d2691e",
+    "coral": "ff7f50", "cornflowerblue": "6495ed", "cornsilk": "fff8dc", "crimson": "dc143c",
+    "cyan": "00ffff", "darkblue": "00008b", "darkcyan": "008b8b", "darkgoldenrod": "b8860b",
+    "darkgray": "a9a9a9", "darkgreen": "006400", "darkgrey": "a9a9a9", "darkkhaki": "bdb76b",
+    "darkmagenta": "8b008b", "darkolivegreen": "556b2f", "darkorange": "ff8c00", "darkorchid": "9932cc",
+    "darkred": "8b0000", "darksalmon": "e9967a", "darkseagreen": "8fbc8f", "darkslateblue": "483d8b",
+    "darkslategray": "2f4f4f", "darkslategrey": "2f4f4f", "darkturquoise": "00ced1", "darkviolet": "9400d3",
+    "deeppink": "ff1493", "deepskyblue": "00bfff", "dimgray": "696969", "dimgrey": "696969",
+    "dodgerblue": "1e90ff", "firebrick": "b22222", "floralwhite": "fffaf0", "forestgreen": "228b22",
+    "fuchsia": "ff00ff", "gainsboro": "dcdcdc", "ghostwhite": "f8f8ff", "gold": "ffd700",
+    "goldenrod": "daa520", "gray": "808080", "green": "008000", "greenyellow": "adff2f",
+    "grey": "808080", "honeydew": "f0fff0", "hotpink": "ff69b4", "indianred": "cd5c5c",
+    "indigo": "4b0082", "ivory": "fffff0", "khaki": "f0e68c", "lavender": "e6e6fa",
+    "lavenderblush": "fff0f5", "lawngreen": "7cfc00", "lemonchiffon": "fffacd", "lightblue": "add8e6",
+    "lightcoral": "f08080", "lightcyan": "e0ffff", "lightgoldenrodyellow": "fafad2", "lightgray": "d3d3d3",
+    "lightgreen": "90ee90", "lightgrey": "d3d3d3", "lightpink": "ffb6c1", "lightsalmon": "ffa07a",
+    "lightseagreen": "20b2aa", "lightskyblue": "87cefa", "lightslategray": "778899", "lightslategrey": "778899",
+    "lightsteelblue": "b0c4de", "lightyellow": "ffffe0", "lime": "00ff00", "limegreen": "32cd32",
+    "linen": "faf0e6", "magenta": "ff00ff", "maroon": "800000", "mediumaquamarine": "66cdaa",
+    "mediumblue": "0000cd", "mediumorchid": "ba55d3", "mediumpurple": "9370db", "mediumseagreen": "3cb371",
+    "mediumslateblue": "7b68ee", "mediumspringgreen": "00fa9a", "mediumturquoise": "48d1cc", "mediumvioletred": "c71585",
+    "midnightblue": "191970", "mintcream": "f5fffa", "mistyrose": "ffe4e1", "moccasin": "ffe4b5",
+    "navajowhite": "ffdead", "navy": "000080", "oldlace": "fdf5e6", "olive": "808000",
+    "olivedrab": "6b8e23", "orange": "ffa500", "orangered": "ff4500", "orchid": "da70d6",
+    "palegoldenrod": "eee8aa", "palegreen": "98fb98", "paleturquoise": "afeeee", "palevioletred": "db7093",
+    "papayawhip": "ffefd5", "peachpuff": "ffdab9", "peru": "cd853f", "pink": "ffc0cb",
+    "plum": "dda0dd", "powderblue": "b0e0e6", "purple": "800080", "rebeccapurple": "663399",
+    "red": "ff0000", "rosybrown": "bc8f8f", "royalblue": "4169e1", "saddlebrown": "8b4513",
+    "salmon": "fa8072", "sandybrown": "f4a460", "seagreen": "2e8b57", "seashell": "fff5ee",
+    "sienna": "a0522d", "silver": "c0c0c0", "skyblue": "87ceeb", "slateblue": "6a5acd",
+    "slategray": "708090", "slategrey": "708090", "snow": "fffafa", "springgreen": "00ff7f",
+    "steelblue": "4682b4", "tan": "d2b48c", "teal": "008080", "thistle": "d8bfd8",
+    "tomato": "ff6347", "turquoise": "40e0d0", "violet": "ee82ee", "wheat": "f5deb3",
+    "white": "ffffff", "whitesmoke": "f5f5f5", "yellow": "ffff00", "yellowgreen": "9acd32",
+}
+
+_HEX_RE = re.compile(r"^#([0-9a-f]{3,4}|[0-9a-f]{6}|[0-9a-f]{8})$")
+_FUNCTION_RE = re.compile(r"^(rgba?|hsla?)\(\s*([^)]*)\)$")
+_ARGUMENT_SPLIT_RE = re.compile(r"\s*,\s*|\s*/\s*|\s+")
+
+
+# === Channel Parsing ===
+def _parse_alpha(value: str) -> Optional[int]:
+    try:
+        alpha = float(value[:-1]) / 100 if value.endswith("%") else float(value)
+    except ValueError:
+        return None
+    return round(min(max(alpha, 0.0), 1.0) * 255)
+
+
+def _parse_rgb_channel(value: str) -> Optional[int]:
+    try:
+        channel = float(value[:-1]) * 2.55 if value.endswith("%") else float(value)
+    except ValueError:
+        return None
+    return round(min(max(channel, 0.0), 255.0))
+
+
+def _parse_percentage(value: str) -> Optional[float]:
+    if not value.endswith("%"):
+        return None
+    try:
+        return min(max(float(value[:-1]) / 100, 0.0), 1.0)
+    except ValueError:
+        return None
+
+
+def _hsl_to_rgb(hue: float, saturation: float, lightness: float) -> tuple:
+    def channel(n: int) -> int:
+        k = (n + hue / 30) % 12
+        a = saturation * min(lightness, 1 - lightness)
+        return round((lightness - a * max(-1, min(k - 3, 9 - k, 1))) * 255)
+
+    return channel(0), channel(8), channel(4)
+
+
+# === Color Parsing ===
+def parse_color(value) -> Optional[tuple]:
+    """Parse a CSS color string into an (r, g, b, a) tuple, or None if invalid."""
+    if not isinstance(value, str):
+        return None
+    return _parse_color_text(value)
+
+
+# Only ever called with strings, so unhashable theme values never reach the cache.
+@lru_cache(maxsize=1024)
+def _parse_color_text(value: str) -> Optional[tuple]:
+    text = value.strip().lower()
+    if text == "transparent":
+        return (0, 0, 0, 0)
+    if text in NAMED_COLORS:
+        text = "#" + NAMED_COLORS[text]
+
+    match = _HEX_RE.match(text)
+    if match:
+        digits = match.group(1)
+        if len(digits) in (3, 4):
+            digits = "".join(c * 2 for c in digits)
+        if len(digits) == 6:
+            digits += "ff"
+        return tuple(int(digits[i:i + 2], 16) for i in range(0, 8, 2))
+
+    match = _FUNCTION_RE.match(text)
+    if not match:
+        return None
+    function, arguments = match.groups()
+    parts = [part for part in _ARGUMENT_SPLIT_RE.split(arguments.strip()) if part]
+    if len(parts) not in (3, 4):
+        return None
+    alpha = _parse_alpha(parts[3]) if len(parts) == 4 else 255
+    if alpha is None:
+        return None
+
+    if function.startswith("rgb"):
+        channels = [_parse_rgb_channel(part) for part in parts[:3]]
+        if None in channels:
+            return None
+        return (*channels, alpha)
+
+    try:
+        hue = float(parts[0][:-3] if parts[0].endswith("deg") else parts[0]) % 360
+    except ValueError:
+        return None
+    saturation = _parse_percentage(parts[1])
+    lightness = _parse_percentage(parts[2])
+    if saturation is None or lightness is None:
+        return None
+    return (*_hsl_to_rgb(hue, saturation, lightness), alpha)
+
+
+def to_hex(rgba: tuple) -> str:
+    r, g, b, a = rgba
+    if a == 255:
+        return "#%02x%02x%02x" % (r, g, b)
+    return "#%02x%02x%02x%02x" % (r, g, b, a)
+
+
+# === Theme Validation ===
+def validate_theme_colors(theme_colors: dict) -> dict:
+    """Parse every light/dark value of a theme once.
+
+    Returns ``{"colors": {key: {mode: rgba}}, "errors": [...]}`` where each error is a
+    dict with ``key``, ``mode``, ``value`` and ``reason``. Invalid values are left out
+    of ``colors`` so callers can apply their own fallback.
+    """
+    parsed = {}
+    errors = []
+    for key, color_data in theme_colors.items():
+        if not isinstance(color_data, list) or len(color_data) <= DARK_COLOR_MODE:
+            errors.append({"key": key, "mode": None, "value": color_data, "reason": "malformed entry"})
+            continue
+        parsed_modes = {}
+        for mode in (LIGHT_COLOR_MODE, DARK_COLOR_MODE):
+            if not isinstance(color_data[mode], str):
+                errors.append({"key": key, "mode": mode, "value": color_data[mode], "reason": "not a color string"})
+                continue
+            rgba = parse_color(color_data[mode])
+            if rgba is None:
+                errors.append({"key": key, "mode": mode, "value": color_data[mode], "reason": "unrecognized color"})
+            else:
+                parsed_modes[mode] = rgba
+        parsed[key] = parsed_modes
+    return {"colors": parsed, "errors": errors}
+
+
+def format_color_errors(errors: list) -> str:
+    lines = []
+    for error in errors:
+        mode = {LIGHT_COLOR_MODE: "light", DARK_COLOR_MODE: "dark"}.get(error["mode"], "entry")
+        lines.append(f"{error['key']} ({mode}): {error['value']!r} - {error['reason']}")
+    return "\n".join(lines)
@@ -0,0 +1,79 @@
+from aqt.theme import colors
+
+from .capabilities import capabilities
+from .perf import perf
+
+LIGHT_COLOR_MODE = 2
+DARK_COLOR_MODE = 3
+
+# === Sync State ===
+# Target mappings keyed by (theme hash, Anki point version).
+_target_cache = {}
+# Anki's own values for every entry the add-on has overwritten.
+_original_colors = {}
+_MISSING = object()
+
+
+def _get_color(name: str, legacy: bool):
+    if legacy:
+        return colors.get(name, _MISSING)
+    return getattr(colors, name, _MISSING)
+
+
+def _set_color(name: str, value, legacy: bool) -> None:
+    if legacy:
+        if value is _MISSING:
+            colors.pop(name, None)
+        else:
+            colors[name] = value
+    elif value is not _MISSING:
+        setattr(colors, name, value)
+
+
+# === Target Mapping ===
+def build_color_targets(theme_colors: dict, legacy: bool, version: int) -> dict:
+    targets = {}
+    for color_name, c in theme_colors.items():
+        light, dark = c[LIGHT_COLOR_MODE], c[DARK_COLOR_MODE]
+        if legacy:
+            variable = c[-1].replace("--", "-")
+            targets[f"day{variable}"] = light
+            targets[f"night{variable}"] = dark
+        elif getattr(colors, color_name, False):
+            if version >= 56:
+                targets[color_name] = {"light": light, "dark": dark}
+            else:
+                targets[color_name] = (light, dark)
+    return targets
+
+
+# === Sync / Restore ===
+def sync_colors(theme_hash: str, theme_colors: dict) -> list:
+    """Apply a theme to aqt.theme.colors in bulk and return the names that changed."""
+    legacy = capabilities.legacy_colors
+    key = (theme_hash, capabilities.anki_version)
+    targets = _target_cache.get(key)
+    perf.count_cache("colors_sync", targets is not None)
+    if targets is None:
+        targets = build_color_targets(theme_colors, legacy, key[1])
+        _target_cache[key] = targets
+
+    changed = []
+    for name, value in targets.items():
+        current = _get_color(name, legacy)
+        if current == value:
+            continue
+        _original_colors.setdefault(name, current)
+        _set_color(name, value, legacy)
+        changed.append(name)
+    return changed
+
+
+def restore_colors() -> list:
+    """Put back Anki's original values for everything sync_colors() changed."""
+    legacy = capabilities.legacy_colors
+    restored = list(_original_colors)
+    for name, value in _original_colors.items():
+        _set_color(name, value, legacy)
+    _original_colors.clear()
+    return restored
@@ -18,6 +18,7 @@ css_files_dir = {
     "global": f"/_addons/{addon_package}/files/global.css",
     "legacy": f"/_addons/{addon_package}/files/legacy.css",
     "Overview": f"/_addons/{addon_package}/files/Overview.css",
+    "performance": f"/_addons/{addon_package}/files/performance.css",
     "QAbout": os.path.join(files_dir, "QAbout.css"),
     "QAddCards": os.path.join(files_dir, "QAddCards.css"),
     "QAddonsDialog": os.path.join(files_dir, "QAddonsDialog.css"),
@@ -29,5 +30,25 @@ css_files_dir = {
     "Reviewer": f"/_addons/{addon_package}/files/Reviewer.css",
     "ReviewerCardBackground": f"/_addons/{addon_package}/files/ReviewerCardBackground.css",
     "ReviewerBottomBar": f"/_addons/{addon_package}/files/ReviewerBottomBar.css",
+    "ReviewerBottomBarModern": f"/_addons/{addon_package}/files/ReviewerBottomBarModern.css",
     "TopToolbar": f"/_addons/{addon_package}/files/TopToolbar.css",
 }
+
+# === Qt Stylesheets ===
+_qss_cache = {}
+
+
+def get_qss(name: str) -> str:
+    """Contents of a dialog stylesheet (files/Q*.css), read once per process."""
+    qss = _qss_cache.get(name)
+    if qss is None:
+        with open(css_files_dir[name], encoding="utf-8") as f:
+            qss = f.read()
+        _qss_cache[name] = qss
+    return qss
+
+
+def preload_qss() -> None:
+    for name, path in css_files_dir.items():
+        if not path.startswith("/_addons/"):
+            get_qss(name)
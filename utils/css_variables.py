@@ -0,0 +1,73 @@
+import os
+import re
+from typing import Optional
+
+# === Paths ===
+this_script_dir = os.path.join(os.path.dirname(__file__), "..")
+files_dir = os.path.join(this_script_dir, "files")
+
+VAR_REFERENCE_RE = re.compile(r"var\(\s*(--[A-Za-z0-9_-]+)")
+
+# Variables Anki's own stylesheets read in the small chrome webviews (toolbar and
+# bottom bars). These pages are rendered by Anki, so their CSS can't be scanned here.
+ANKI_CHROME_VARIABLES = frozenset({
+    # 2.1.56+ palette
+    "--canvas", "--canvas-elevated", "--canvas-inset", "--canvas-overlay",
+    "--fg", "--fg-subtle", "--fg-faint", "--fg-disabled", "--fg-link",
+    "--border", "--border-subtle", "--border-strong", "--border-focus",
+    "--button-bg", "--button-disabled", "--button-hover-border",
+    "--button-gradient-start", "--button-grandient-end",
+    "--button-primary-bg", "--button-primary-disabled",
+    "--button-primary-gradient-start", "--button-primary-gradient-end",
+    "--shadow", "--shadow-focus", "--shadow-inset", "--shadow-subtle",
+    "--selected-bg", "--selected-fg", "--highlighted-bg", "--highlighted-fg",
+    "--scrollbar-bg", "--scrollbar-bg-hover", "--scrollbar-bg-active",
+    "--state-new", "--state-learn", "--state-review", "--state-buried",
+    "--state-suspended", "--state-marked",
+    "--bs-body-bg",
+    # Pre-2.1.56 names
+    "--window-bg", "--frame-bg", "--tooltip-bg", "--text-fg", "--link",
+    "--faint-border", "--medium-border", "--button-focus-bg", "--focus-shadow-color",
+    "--highlight-bg", "--highlight-fg", "--disabled", "--slightly-grey-text",
+    "--new-count", "--learn-count", "--review-count", "--zero-count",
+})
+
+# Contexts that receive only the variables they use; every other context
+# (deck browser, overview, reviewer, editor, card layout, ...) gets the full set.
+CONTEXT_STYLESHEETS = {
+    "TopToolbar": ("global", "TopToolbar"),
+    "BottomBar": ("global", "BottomBar"),
+    "ReviewerBottomBar": ("global", "BottomBar", "ReviewerBottomBar", "ReviewerBottomBarModern"),
+}
+
+# === Analysis Cache ===
+_stylesheet_variables = {}
+_context_variables = {}
+
+
+def scan_stylesheet_variables(stylesheet: str) -> frozenset:
+    variables = _stylesheet_variables.get(stylesheet)
+    if variables is None:
+        path = os.path.join(files_dir, f"{stylesheet}.css")
+        try:
+            with open(path, encoding="utf-8") as f:
+                variables = frozenset(VAR_REFERENCE_RE.findall(f.read()))
+        except OSError:
+            variables = frozenset()
+        _stylesheet_variables[stylesheet] = variables
+    return variables
+
+
+def get_context_variables(context_key: Optional[str]) -> Optional[frozenset]:
+    """Minimal variable set for a context, or None when it needs every variable."""
+    stylesheets = CONTEXT_STYLESHEETS.get(context_key)
+    if stylesheets is None:
+        return None
+    variables = _context_variables.get(context_key)
+    if variables is None:
+        variables = set(ANKI_CHROME_VARIABLES)
+        for stylesheet in stylesheets:
+            variables |= scan_stylesheet_variables(stylesheet)
+        variables = frozenset(variables)
+        _context_variables[context_key] = variables
+    return variables
@@ -0,0 +1,120 @@
+from typing import Optional
+
+from ..config import get_config
+from .css_variables import get_context_variables
+from .hooks import theme_did_apply
+from .logger import logger
+from .perf import perf
+from .themes import get_theme, get_theme_hash, normalize_theme_name
+
+# === Theme State ===
+# The variables below follow whatever theme was last applied, global or per-deck.
+LIGHT_COLOR_MODE = 2
+DARK_COLOR_MODE = 3
+
+
+def get_active_theme_name(config_data: dict) -> str:
+    return normalize_theme_name(config_data.get("theme_name", "Anki"))
+
+
+themes_parsed = get_theme(get_active_theme_name(get_config()))
+themes_hash = get_theme_hash(themes_parsed)
+
+
+def on_theme_did_apply(theme: dict, mode: int) -> None:
+    logger.debug("updating theme")
+    global themes_parsed, themes_hash
+    themes_parsed = theme
+    themes_hash = get_theme_hash(theme)
+
+
+theme_did_apply.append(on_theme_did_apply)
+
+
+# === Variable Stylesheets ===
+# Compiled variable stylesheets keyed by (theme hash, typography settings).
+# Bounded because live preview produces a new theme hash on every frame.
+CUSTOM_CSS_CACHE_LIMIT = 64
+custom_css_cache = {}
+perf.add_gauge("cache_size/custom_css", lambda: len(custom_css_cache))
+
+# Performance mode: shadow colors become transparent and each gradient stop takes
+# its button's flat background color (kept as is if the theme has no such color).
+PERFORMANCE_MODE_COLORS = {
+    "SHADOW": None,
+    "SHADOW_INSET": None,
+    "SHADOW_SUBTLE": None,
+    "BUTTON_GRADIENT_START": "BUTTON_BG",
+    "BUTTON_GRADIENT_END": "BUTTON_BG",
+    "BUTTON_PRIMARY_GRADIENT_START": "BUTTON_PRIMARY_BG",
+    "BUTTON_PRIMARY_GRADIENT_END": "BUTTON_PRIMARY_BG",
+}
+
+
+def build_custom_css(
+    include_typography: bool = True,
+    context_key: Optional[str] = None,
+    performance_mode: Optional[bool] = None,
+) -> str:
+    current_config = get_config()
+    if performance_mode is None:
+        performance_mode = current_config.get("performance_mode", False)
+    typography_key = None
+    if include_typography and current_config.get("font_customization_enabled", False):
+        typography_key = (current_config["font"], current_config["fallbackFonts"], current_config["font_size"])
+    cache_key = (themes_hash, typography_key, context_key, performance_mode)
+    cached = custom_css_cache.get(cache_key)
+    perf.count_cache("custom_css", cached is not None)
+    if cached is not None:
+        return cached
+
+    used_variables = get_context_variables(context_key)
+    theme_colors_light = ""
+    theme_colors_dark = ""
+    colors = themes_parsed.get("colors")
+    for color_name in colors:
+        color = colors.get(color_name)
+        variable = color[-1] or f"--{color_name.lower().replace('_','-')}"
+        if used_variables is not None and variable not in used_variables:
+            continue
+        light, dark = color[LIGHT_COLOR_MODE], color[DARK_COLOR_MODE]
+        if performance_mode and color_name in PERFORMANCE_MODE_COLORS:
+            flat_name = PERFORMANCE_MODE_COLORS[color_name]
+            if flat_name is None:
+                light = dark = "transparent"
+            elif flat_name in colors:
+                light, dark = colors[flat_name][LIGHT_COLOR_MODE], colors[flat_name][DARK_COLOR_MODE]
+        theme_colors_light += f"{variable}: {light};\n        "
+        theme_colors_dark += f"{variable}: {dark};\n        "
+    typography_css = ""
+    if typography_key:
+        font, fallback_fonts, font_size = typography_key
+        if fallback_fonts:
+            font = f"{font}, {fallback_fonts}"
+        typography_css = """
+    html {
+        font-family: %s;
+        font-size: %spx !important;
+        --font-size: %spx !important;
+    }
+""" % (font, font_size, font_size)
+    custom_css = """
+    /* Light */
+    :root,
+    :root .isMac,
+    :root .isWin,
+    :root .isLin {
+        %s
+    }
+    /* Dark */
+    :root body.nightMode,
+    :root body.isWin.nightMode,
+    :root body.isMac.nightMode,
+    :root body.isLin.nightMode {
+        %s
+    }
+%s""" % (theme_colors_light, theme_colors_dark, typography_css)
+    if len(custom_css_cache) >= CUSTOM_CSS_CACHE_LIMIT:
+        custom_css_cache.clear()
+    custom_css_cache[cache_key] = custom_css
+    return custom_css
@@ -0,0 +1,87 @@
+import json
+from typing import Optional
+
+from aqt import mw
+
+from .logger import logger
+from .themes import list_theme_names
+
+# Main window states that belong to a single deck.
+DECK_STATES = ("overview", "review")
+
+
+# === Deck Theme Index ===
+class DeckThemeIndex:
+    """Deck -> theme lookups compiled from config["deck_themes"].
+
+    Keys are deck names (case-insensitive) or deck ids. A deck without an entry of its
+    own uses its closest parent's, so "Exams" also covers "Exams::Biology".
+    """
+
+    def __init__(self, mapping: dict):
+        available = set(list_theme_names())
+        self.by_id = {}
+        self.by_name = {}
+        for deck, theme_name in mapping.items():
+            if isinstance(theme_name, str) and theme_name.endswith(".json"):
+                theme_name = theme_name[:-5]
+            if theme_name not in available:
+                logger.debug(f"Ignoring deck theme {deck!r}: unknown theme {theme_name!r}")
+                continue
+            key = str(deck).strip()
+            if key.isdigit():
+                self.by_id[int(key)] = theme_name
+            else:
+                self.by_name[key.casefold()] = theme_name
+        # Deck name -> theme name (or None), filled on first lookup of each deck.
+        self.resolved = {}
+
+    def theme_names(self) -> set:
+        return set(self.by_id.values()) | set(self.by_name.values())
+
+    def lookup(self, deck_id: int, deck_name: str) -> Optional[str]:
+        if deck_id in self.by_id:
+            return self.by_id[deck_id]
+        key = deck_name.casefold()
+        if key not in self.resolved:
+            theme_name = None
+            parts = key.split("::")
+            while parts and theme_name is None:
+                theme_name = self.by_name.get("::".join(parts))
+                parts.pop()
+            self.resolved[key] = theme_name
+        return self.resolved[key]
+
+
+# Compiled index for the current mapping, keyed by its serialized form.
+_index_cache = {}
+
+
+def get_deck_theme_index(mapping: dict) -> DeckThemeIndex:
+    key = json.dumps(mapping, sort_keys=True)
+    index = _index_cache.get(key)
+    if index is None:
+        index = DeckThemeIndex(mapping)
+        _index_cache.clear()
+        _index_cache[key] = index
+    return index
+
+
+# === Current Deck ===
+def get_current_deck_id() -> Optional[int]:
+    col = getattr(mw, "col", None)
+    if col is None:
+        return None
+    if hasattr(col.decks, "get_current_id"):
+        return col.decks.get_current_id()
+    return col.decks.selected()
+
+
+def get_deck_theme_name(mapping: dict, state: str) -> Optional[str]:
+    """Theme assigned to the current deck when ``state`` shows a single deck, else None."""
+    if not mapping or state not in DECK_STATES:
+        return None
+    deck_id = get_current_deck_id()
+    if deck_id is None:
+        return None
+    return get_deck_theme_index(mapping).lookup(deck_id, mw.col.decks.name(deck_id))
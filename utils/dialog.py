@@ -1,31 +1,44 @@
-import json
-
 # === Anki/Qt Imports ===
-from aqt import gui_hooks, mw
+from aqt import mw
 from aqt.qt import *
-from aqt.theme import colors, theme_manager
 from aqt.utils import showInfo
-from aqt.webview import AnkiWebView
-from anki.utils import pointVersion
 
 # === Local Imports ===
 from ..config import config, get_config, write_config
-from ..injections.toolbar import redraw_toolbar, redraw_toolbar_legacy
+from .capabilities import capabilities
+from .color_validation import format_color_errors, parse_color, to_hex
 from .dark_title_bar import dwmapi, set_dark_titlebar_qt
+from .font_picker import LazyFontComboBox
+from .leak_check import leak_check_parent
 from .logger import logger
-from .modules import *
+from .perf import perf
+from .theme_apply import (
+    DARK_COLOR_MODE,
+    LIGHT_COLOR_MODE,
+    get_active_theme_name,
+    get_effective_color_mode,
+    preview_theme_colors,
+    reapply_saved_theme,
+    update_theme,
+)
+from .theme_gallery import ThemeGallery, render_theme_thumbnail
+from .theme_manifest import DEFAULT_TAGLINE, SWATCH_MODES, get_theme_manifest
 from .themes import (
+    diff_theme,
     ensure_user_theme,
     get_system_theme,
     get_theme,
-    list_system_theme_names,
+    get_theme_color_report,
+    list_theme_names,
     normalize_theme_name,
+    validate_theme_text,
+    validation_failure,
     write_theme,
 )
 from .translation import get_texts
 
 # === Language Support ===
-if module_has_attribute("anki.lang", "current_lang"):
+if capabilities.has_current_lang:
     from anki.lang import current_lang, lang_to_disk_lang, compatMap
 else:
     from anki.lang import currentLang as current_lang, lang_to_disk_lang, compatMap
@@ -35,32 +48,14 @@ MIN_WIDTH = 537
 MIN_HEIGHT = 680
 MIN_DIALOG_WIDTH = 360
 MIN_DIALOG_HEIGHT = 320
-
-# === Theme State ===
-LIGHT_COLOR_MODE = 2
-DARK_COLOR_MODE = 3
-
-THEME_PREVIEW_TAGLINES = {
-    "Anki": "Default balanced palette",
-    "Evergreen": "Calm moss and pine tones",
-    "Graphite": "Refined slate neutrals",
-    "Nord": "Cool arctic blue-greys",
-    "Sakura": "Soft rose and plum tones",
-    "Solarized": "Warm parchment and teal",
-    "Sunset": "Muted terracotta warmth",
-}
-
-
-def get_effective_color_mode() -> int:
-    return DARK_COLOR_MODE if theme_manager.get_night_mode() else LIGHT_COLOR_MODE
-
-
-def get_active_theme_name(config_data: dict) -> str:
-    return normalize_theme_name(config_data.get("theme_name", "Anki"))
-
-
-initial_config = get_config()
-themes_parsed = get_theme(get_active_theme_name(initial_config))
+# Live preview applies at most once per animation frame.
+PREVIEW_INTERVAL_MS = 16
+# Idle time after the last keystroke before the theme editor revalidates.
+VALIDATION_DELAY_MS = 300
+
+# === Dialog State ===
+# Theme being edited; separate from the applied theme in theme_apply.
+themes_parsed = None
 color_mode = get_effective_color_mode()
 
 # === Language Utilities ===
@@ -86,21 +81,117 @@ class AnkiRedesignThemeEditor(QDialog):
         self.resize(MIN_WIDTH, MIN_HEIGHT)
         self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         set_dark_titlebar_qt(self, dwmapi, fix=False)
+        # Validation state; results from superseded runs are dropped by generation.
+        self.validation_generation = 0
+        self.validation_result = None
+        self.validation_timer = QTimer(self)
+        self.validation_timer.setSingleShot(True)
+        self.validation_timer.setInterval(VALIDATION_DELAY_MS)
+        qconnect(self.validation_timer.timeout, self.start_validation)
+        qconnect(self.finished, self.stop_validation)
         # Root layout
         self.root_layout = QVBoxLayout(self)
         # Main layout
         self.layout = QVBoxLayout()
-        self.textedit = QTextEdit()
-        themes_plaintext = open(self.user_theme_path, encoding="utf-8").read()
+        self.textedit = QPlainTextEdit()
+        self.textedit.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        with open(self.user_theme_path, encoding="utf-8") as f:
+            themes_plaintext = f.read()
         self.textedit.setPlainText(themes_plaintext)
+        self.saved_theme = validate_theme_text(themes_plaintext, self.user_theme_path)["resolved"]
+        qconnect(self.textedit.textChanged, self.on_text_changed)
         self.layout.addWidget(self.textedit)
+        self.status_label = QLabel()
+        self.status_label.setWordWrap(True)
+        self.layout.addWidget(self.status_label)
         self.root_layout.addLayout(self.layout)
         self.root_layout.addLayout(self.make_button_box())
+        self.start_validation()
+
+    # === Background Validation ===
+    def on_text_changed(self) -> None:
+        self.validation_result = None
+        self.validation_timer.start()
+
+    def start_validation(self) -> None:
+        self.validation_generation += 1
+        generation = self.validation_generation
+        text = self.textedit.toPlainText()
+        path = self.user_theme_path
+        mw.taskman.run_in_background(
+            lambda: validate_theme_text(text, path),
+            lambda future: self.on_validation_done(generation, future),
+        )
+
+    def stop_validation(self, *_) -> None:
+        self.validation_timer.stop()
+        self.validation_generation = -1
+
+    def on_validation_done(self, generation: int, future) -> None:
+        if generation != self.validation_generation:
+            return
+        try:
+            self.validation_result = future.result()
+        except Exception as error:
+            logger.debug(f"Theme validation failed: {error}")
+            self.validation_result = validation_failure(0, f"Theme cannot be validated: {error}")
+        self.show_validation_result(self.validation_result)
+
+    def show_validation_result(self, result: dict) -> None:
+        selections = []
+        for issues, color in ((result["warnings"], QColor("#d97706")), (result["errors"], QColor("#dc2626"))):
+            for issue in issues:
+                selection = QTextEdit.ExtraSelection()
+                selection.format.setUnderlineStyle(QTextCharFormat.UnderlineStyle.WaveUnderline)
+                selection.format.setUnderlineColor(color)
+                selection.format.setToolTip(issue["message"])
+                cursor = QTextCursor(self.textedit.document())
+                cursor.setPosition(min(issue["offset"], self.textedit.document().characterCount() - 1))
+                cursor.movePosition(
+                    QTextCursor.MoveOperation.NextCharacter,
+                    QTextCursor.MoveMode.KeepAnchor,
+                    max(1, issue["length"]),
+                )
+                selection.cursor = cursor
+                selections.append(selection)
+        self.textedit.setExtraSelections(selections)
+
+        issues = result["errors"] + result["warnings"]
+        if not issues:
+            self.status_label.clear()
+            self.status_label.setToolTip("")
+            return
+        self.status_label.setStyleSheet(
+            'QLabel { color: %s }' % ("#dc2626" if result["errors"] else "#d97706")
+        )
+        self.status_label.setText(
+            self.texts.get(
+                "theme_editor_issues",
+                "{errors} error(s), {warnings} warning(s): {first}",
+            ).format(errors=len(result["errors"]), warnings=len(result["warnings"]), first=issues[0]["message"])
+        )
+        self.status_label.setToolTip("\n".join(issue["message"] for issue in issues))
 
     def save_edit(self) -> None:
-        themes_parsed = json.loads(self.textedit.toPlainText())
-        write_theme(self.user_theme_path, themes_parsed)
-        self.config_editor.update()
+        self.validation_timer.stop()
+        # Revalidate synchronously only if typing outran the background check.
+        result = self.validation_result
+        if result is None:
+            try:
+                result = validate_theme_text(self.textedit.toPlainText(), self.user_theme_path)
+            except Exception as error:
+                logger.debug(f"Theme validation failed: {error}")
+                result = validation_failure(0, f"Theme cannot be validated: {error}")
+            self.validation_generation += 1
+            self.show_validation_result(result)
+        if result["errors"]:
+            return
+        write_theme(self.user_theme_path, result["theme"])
+        edited_theme = result["resolved"]
+        if self.saved_theme is None:
+            self.config_editor.update()
+        else:
+            self.config_editor.apply_theme_edits(edited_theme, diff_theme(self.saved_theme, edited_theme))
         self.accept()
 
     def make_button_box(self) -> QWidget:
@@ -133,7 +224,7 @@ class AnkiRedesignThemeEditor(QDialog):
 
 # === Configuration Dialog ===
 class AnkiRedesignConfigDialog(QDialog):
-    def __init__(self, parent: QWidget, *args, **kwargs):
+    def __init__(self, parent: QWidget, *args, build: bool = True, **kwargs):
         super().__init__(parent=parent or mw, *args, **kwargs)
         self.texts = get_texts(get_anki_lang())
         self.setWindowModality(Qt.WindowModality.ApplicationModal)
@@ -142,12 +233,23 @@ class AnkiRedesignConfigDialog(QDialog):
         self.setMinimumSize(MIN_DIALOG_WIDTH, MIN_DIALOG_HEIGHT)
         self.setSizeGripEnabled(True)
         self.resize(self.fit_size_to_screen(MIN_WIDTH, MIN_HEIGHT))
-        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         set_dark_titlebar_qt(self, dwmapi, fix=False)
 
+        # Live preview state
+        self.preview_active = False
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(PREVIEW_INTERVAL_MS)
+        qconnect(self.preview_timer.timeout, self.apply_preview)
+        # One color picker shared by every color input, created on first use.
+        self.color_dialog = None
+        self.color_preview = None
+
         # Theme color state
         self.current_config = get_config()
-        self.available_themes = list_system_theme_names()
+        self.theme_manifest = get_theme_manifest()
+        self.preview_swatches = self.get_preview_swatches()
+        self.available_themes = list_theme_names()
         self.theme_name = get_active_theme_name(self.current_config)
         if self.theme_name not in self.available_themes and self.available_themes:
             self.theme_name = self.available_themes[0]
@@ -163,21 +265,40 @@ class AnkiRedesignConfigDialog(QDialog):
         self.theme_decks = ["CURRENT_DECK", "NEW_COUNT", "LEARN_COUNT", "REVIEW_COUNT", "ZERO_COUNT"]
         self.theme_browse = ["BURIED_FG", "SUSPENDED_FG", "MARKED_BG", "FLAG1_BG", "FLAG1_FG", "FLAG2_BG", "FLAG2_FG", "FLAG3_BG", "FLAG3_FG", "FLAG4_BG", "FLAG4_FG", "FLAG5_BG", "FLAG5_FG", "FLAG6_BG", "FLAG6_FG", "FLAG7_BG", "FLAG7_FG"]
         self.theme_extra = []
-        if pointVersion() >= 56:
+        if capabilities.modern_theme:
             self.theme_general = ['FG', 'FG_DISABLED', 'FG_FAINT', 'FG_LINK', 'FG_SUBTLE'] + ['CANVAS', 'CANVAS_CODE', 'CANVAS_ELEVATED', 'CANVAS_INSET', 'CANVAS_OVERLAY']
             self.theme_decks = ['BORDER', 'BORDER_FOCUS', 'BORDER_STRONG', 'BORDER_SUBTLE'] + ['BUTTON_BG', 'BUTTON_DISABLED', 'BUTTON_GRADIENT_END', 'BUTTON_GRADIENT_START', 'BUTTON_HOVER_BORDER', 'BUTTON_PRIMARY_BG', 'BUTTON_PRIMARY_DISABLED', 'BUTTON_PRIMARY_GRADIENT_END', 'BUTTON_PRIMARY_GRADIENT_START']
             self.theme_browse = ['ACCENT_CARD', 'ACCENT_DANGER', 'ACCENT_NOTE'] + ['STATE_BURIED', 'STATE_LEARN', 'STATE_MARKED', 'STATE_NEW', 'STATE_REVIEW', 'STATE_SUSPENDED'] + ['FLAG_1', 'FLAG_2', 'FLAG_3', 'FLAG_4', 'FLAG_5', 'FLAG_6', 'FLAG_7']
             self.theme_extra = ['SCROLLBAR_BG', 'SCROLLBAR_BG_ACTIVE', 'SCROLLBAR_BG_HOVER'] + ['HIGHLIGHT_BG', 'HIGHLIGHT_FG'] + ['SELECTED_BG', 'SELECTED_FG'] + ['SHADOW', 'SHADOW_FOCUS', 'SHADOW_INSET', 'SHADOW_SUBTLE']
 
-        # === Layout ===
+        if build:
+            for _ in self.build_steps():
+                pass
+
+    # === Layout ===
+    def build_steps(self):
+        """Create the widgets one color row or settings section per step.
+
+        The prewarm scheduler runs one step per idle slice; opening the dialog runs them all.
+        """
         self.root_layout = QVBoxLayout(self)
         self.layout = QVBoxLayout()
         self.tabs = QTabWidget(objectName="tabs")
         self.tabs.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
-        self.tab_general = self.create_scrolled_color_tab("general", self.theme_general)
-        self.tab_decks = self.create_scrolled_color_tab("decks", self.theme_decks)
-        self.tab_browse = self.create_scrolled_color_tab("browse", self.theme_browse)
-        self.tab_extra = self.create_scrolled_color_tab("extra", self.theme_extra)
+        color_tabs = []
+        for object_name, keys in (
+            ("general", self.theme_general),
+            ("decks", self.theme_decks),
+            ("browse", self.theme_browse),
+            ("extra", self.theme_extra),
+        ):
+            tab, color_form = self.create_scrolled_color_tab(object_name)
+            color_tabs.append(tab)
+            yield
+            for key in keys:
+                color_form.addRow(QLabel(self.theme_colors.get(key)[0]), self.color_input(key))
+                yield
+        self.tab_general, self.tab_decks, self.tab_browse, self.tab_extra = color_tabs
 
         self.tab_settings = QWidget(objectName="settings")
         self.tab_settings_layout = QVBoxLayout(self.tab_settings)
@@ -187,66 +308,25 @@ class AnkiRedesignConfigDialog(QDialog):
         self.settings_layout = QFormLayout(self.settings_content_widget)
         self.settings_layout.setContentsMargins(0, 0, 0, 0)
         self.settings_layout.setVerticalSpacing(10)
+        self.theme_errors_label = QLabel()
+        self.theme_errors_label.setWordWrap(True)
+        self.theme_errors_label.setStyleSheet('QLabel { color: #dc2626 }')
+        self.settings_layout.addRow(self.theme_errors_label)
+        self.update_theme_errors_label()
         self.theme_label = QLabel(self.texts.get("theme_preset_label", "Theme Preset:"))
         self.theme_label.setStyleSheet(
             'QLabel { font-size: 14px; font-weight: bold }')
         self.settings_layout.addRow(self.theme_label)
-        self.theme_buttons_group = QButtonGroup(self)
-        self.theme_buttons_group.setExclusive(True)
-        self.theme_buttons = {}
-        self.theme_preview_icon_labels = {}
-        self.theme_buttons_widget = QWidget()
-        self.theme_buttons_layout = QVBoxLayout(self.theme_buttons_widget)
-        self.theme_buttons_layout.setContentsMargins(0, 0, 0, 0)
-        self.theme_buttons_layout.setSpacing(6)
-        self.theme_buttons_widget.setStyleSheet(
-            """
-            QPushButton#themePreviewButton {
-                background-color: rgba(127, 127, 127, 0.10);
-                border: 1px solid rgba(127, 127, 127, 0.32);
-                border-radius: 10px;
-                min-height: 64px;
-                padding: 0;
-            }
-            QPushButton#themePreviewButton:hover {
-                background-color: rgba(127, 127, 127, 0.16);
-                border: 1px solid rgba(127, 127, 127, 0.55);
-            }
-            QPushButton#themePreviewButton:checked {
-                background-color: rgba(59, 130, 246, 0.18);
-                border: 1px solid #3B82F6;
-            }
-            QLabel#themePreviewTitle {
-                font-size: 14px;
-                font-weight: 700;
-                color: palette(text);
-            }
-            QLabel#themePreviewDescription {
-                font-size: 13px;
-                font-weight: 400;
-                color: palette(window-text);
-            }
-            """
+        self.theme_gallery = ThemeGallery(
+            self.available_themes,
+            lambda theme_name: self.theme_manifest.get(theme_name, {}).get("tagline", DEFAULT_TAGLINE),
+            self.build_theme_preview_pixmap,
+            self.texts.get("theme_filter_placeholder", "Filter themes"),
         )
-        primary_theme = "Anki" if "Anki" in self.available_themes else self.available_themes[0]
-        other_themes = [theme for theme in self.available_themes if theme != primary_theme]
-
-        primary_button = self.create_theme_preview_button(primary_theme)
-        self.theme_buttons_layout.addWidget(primary_button)
-
-        other_themes_grid = QGridLayout()
-        other_themes_grid.setContentsMargins(0, 0, 0, 0)
-        other_themes_grid.setHorizontalSpacing(6)
-        other_themes_grid.setVerticalSpacing(6)
-        other_themes_grid.setColumnStretch(0, 1)
-        other_themes_grid.setColumnStretch(1, 1)
-        for idx, theme_name in enumerate(other_themes):
-            button = self.create_theme_preview_button(theme_name)
-            row = idx // 2
-            col = idx % 2
-            other_themes_grid.addWidget(button, row, col)
-        self.theme_buttons_layout.addLayout(other_themes_grid)
-        self.settings_layout.addRow(self.theme_buttons_widget)
+        self.theme_gallery.theme_selected.connect(self.on_theme_changed)
+        self.theme_gallery.select_theme(self.theme_name)
+        self.settings_layout.addRow(self.theme_gallery)
+        yield
         theme_to_font_gap = QWidget()
         theme_to_font_gap.setFixedHeight(14)
         self.settings_layout.addRow(theme_to_font_gap)
@@ -265,6 +345,19 @@ class AnkiRedesignConfigDialog(QDialog):
         )
         self.settings_layout.addRow(self.match_card_template_background_to_theme)
 
+        self.live_preview = QCheckBox(self.texts.get("live_preview", "Preview color changes live"))
+        self.live_preview.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self.live_preview.setChecked(bool(self.current_config.get("live_preview", True)))
+        self.live_preview.stateChanged.connect(lambda _: self.on_live_preview_toggled())
+        self.settings_layout.addRow(self.live_preview)
+
+        self.performance_mode = QCheckBox(
+            self.texts.get("performance_mode", "Performance mode (no shadows, gradients or animations)")
+        )
+        self.performance_mode.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self.performance_mode.setChecked(bool(self.current_config.get("performance_mode", False)))
+        self.settings_layout.addRow(self.performance_mode)
+
         font_section_gap = QWidget()
         font_section_gap.setFixedHeight(8)
         self.settings_layout.addRow(font_section_gap)
@@ -285,9 +378,9 @@ class AnkiRedesignConfigDialog(QDialog):
         )
         self.settings_layout.addRow(self.enable_font_customization)
 
-        self.interface_font = QFontComboBox()
+        self.interface_font = LazyFontComboBox()
         self.interface_font.setFixedWidth(200)
-        self.interface_font.setCurrentFont(QFont(self.current_config["font"]))
+        self.interface_font.set_current_family(self.current_config["font"])
         self.settings_layout.addRow(self.interface_font)
 
         self.font_size = QSpinBox()
@@ -296,6 +389,7 @@ class AnkiRedesignConfigDialog(QDialog):
         self.font_size.setSuffix("px")
         self.settings_layout.addRow(self.font_size)
         self.update_font_customization_state()
+        yield
 
         settings_scroll = QScrollArea()
         settings_scroll.setWidgetResizable(True)
@@ -314,7 +408,35 @@ class AnkiRedesignConfigDialog(QDialog):
         self.root_layout.addLayout(self.layout)
         self.root_layout.addLayout(self.make_button_box())
         self.setLayout(self.root_layout)
-        self.show()
+
+    # === Reuse Between Openings ===
+    def sync_with_config(self) -> None:
+        """Bring the hidden dialog back in line with the saved config and theme files."""
+        global color_mode
+        self.current_config = get_config()
+        self.match_card_template_background_to_theme.setChecked(
+            bool(self.current_config.get("match_card_template_background_to_theme", True))
+        )
+        self.enable_font_customization.setChecked(
+            bool(self.current_config.get("font_customization_enabled", False))
+        )
+        self.interface_font.set_current_family(self.current_config["font"])
+        self.font_size.setValue(self.current_config["font_size"])
+        self.update_font_customization_state()
+        self.live_preview.blockSignals(True)
+        self.live_preview.setChecked(bool(self.current_config.get("live_preview", True)))
+        self.live_preview.blockSignals(False)
+        self.performance_mode.setChecked(bool(self.current_config.get("performance_mode", False)))
+
+        self.theme_name = get_active_theme_name(self.current_config)
+        available_themes = list_theme_names() or [self.theme_name]
+        if available_themes != self.available_themes:
+            self.available_themes = available_themes
+            self.theme_gallery.set_theme_names(available_themes)
+        color_mode = get_effective_color_mode()
+        self.theme_gallery.select_theme(self.theme_name)
+        self.tabs.setCurrentIndex(0)
+        self.reload_theme()
 
     def fit_size_to_screen(self, preferred_width: int, preferred_height: int) -> QSize:
         screen = self.screen() or QGuiApplication.primaryScreen()
@@ -327,14 +449,17 @@ class AnkiRedesignConfigDialog(QDialog):
         height = max(MIN_DIALOG_HEIGHT, min(preferred_height, max_height))
         return QSize(width, height)
 
-    def create_scrolled_color_tab(self, object_name: str, colors: list) -> QWidget:
+    def create_scrolled_color_tab(self, object_name: str) -> tuple:
+        """An empty color tab and the form its color rows are added to."""
         tab = QWidget(objectName=object_name)
         tab_layout = QVBoxLayout(tab)
         tab_layout.setContentsMargins(0, 0, 0, 0)
         tab_layout.setSpacing(0)
 
         content_widget = QWidget()
-        content_widget.setLayout(self.create_color_picker_layout(colors))
+        color_form = QFormLayout()
+        content_layout = self.create_color_picker_layout(color_form)
+        content_widget.setLayout(content_layout)
 
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
@@ -342,11 +467,26 @@ class AnkiRedesignConfigDialog(QDialog):
         scroll.setWidget(content_widget)
 
         tab_layout.addWidget(scroll)
-        return tab
+        return tab, color_form
 
     def update(self) -> None:
         self.reload_theme()
 
+    def apply_theme_edits(self, edited_theme: dict, changes: dict) -> None:
+        """Take a save from the advanced editor, touching only the keys it changed."""
+        if changes["removed_colors"] or changes["other"]:
+            self.reload_theme()
+            return
+        if not changes["colors"]:
+            return
+        edited_colors = edited_theme["colors"]
+        for key in changes["colors"]:
+            self.theme_colors[key] = list(edited_colors[key])
+        self.refresh_color_inputs()
+        self.refresh_theme_preview_icons()
+        self.update_theme_errors_label()
+        self.schedule_preview()
+
     def sync_bs_body_bg_with_canvas(self) -> None:
         canvas = self.theme_colors.get("CANVAS")
         if not canvas or len(canvas) < 5:
@@ -371,6 +511,20 @@ class AnkiRedesignConfigDialog(QDialog):
         self.sync_bs_body_bg_with_canvas()
         self.refresh_color_inputs()
         self.refresh_theme_preview_icons()
+        self.update_theme_errors_label()
+
+    def update_theme_errors_label(self) -> None:
+        errors = get_theme_color_report(themes_parsed)["errors"]
+        self.theme_errors_label.setVisible(bool(errors))
+        if not errors:
+            return
+        self.theme_errors_label.setText(
+            self.texts.get(
+                "theme_color_errors",
+                "{count} invalid color value(s) in this theme. Hover for details.",
+            ).format(count=len(errors))
+        )
+        self.theme_errors_label.setToolTip(format_color_errors(errors))
 
     def refresh_color_inputs(self) -> None:
         for update in self.updates:
@@ -378,10 +532,37 @@ class AnkiRedesignConfigDialog(QDialog):
 
     def on_theme_changed(self, theme_name: str) -> None:
         self.theme_name = normalize_theme_name(theme_name)
-        button = self.theme_buttons.get(self.theme_name)
-        if button and not button.isChecked():
-            button.setChecked(True)
+        self.theme_gallery.select_theme(self.theme_name)
         self.reload_theme()
+        self.schedule_preview()
+
+    # === Live Preview ===
+    def schedule_preview(self) -> None:
+        # Changes arriving while the timer runs are folded into its single application.
+        if self.live_preview.isChecked() and not self.preview_timer.isActive():
+            self.preview_timer.start()
+
+    def apply_preview(self) -> None:
+        self.preview_active = True
+        with perf.measure("live_preview"):
+            preview_theme_colors(dict(themes_parsed, colors=self.theme_colors))
+
+    def end_preview(self, revert: bool) -> None:
+        self.preview_timer.stop()
+        if self.preview_active and revert:
+            with perf.measure("live_preview/revert"):
+                reapply_saved_theme()
+        self.preview_active = False
+
+    def on_live_preview_toggled(self) -> None:
+        if self.live_preview.isChecked():
+            self.schedule_preview()
+        else:
+            self.end_preview(revert=True)
+
+    def reject(self) -> None:
+        self.end_preview(revert=True)
+        super().reject()
 
     def update_font_customization_state(self) -> None:
         enabled = self.enable_font_customization.isChecked()
@@ -389,112 +570,27 @@ class AnkiRedesignConfigDialog(QDialog):
         self.interface_font.setEnabled(enabled)
         self.font_size.setEnabled(enabled)
 
-    def create_theme_preview_button(self, theme_name: str) -> QPushButton:
-        button = QPushButton(objectName="themePreviewButton")
-        button.setCheckable(True)
-        button.setAutoExclusive(True)
-        button.setMinimumHeight(64)
-        button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        button.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-
-        content_layout = QHBoxLayout(button)
-        content_layout.setContentsMargins(10, 4, 10, 4)
-        content_layout.setSpacing(10)
-
-        preview = self.build_theme_preview_icon(theme_name).pixmap(92, 56)
-        icon_label = QLabel()
-        icon_label.setFixedSize(92, 56)
-        icon_label.setPixmap(preview)
-        icon_label.setScaledContents(False)
-        self.theme_preview_icon_labels[theme_name] = icon_label
-
-        text_layout = QVBoxLayout()
-        text_layout.setContentsMargins(0, 0, 0, 0)
-        text_layout.setSpacing(1)
-
-        title_label = QLabel(theme_name, objectName="themePreviewTitle")
-        description_label = QLabel(
-            THEME_PREVIEW_TAGLINES.get(theme_name, "Balanced study palette"),
-            objectName="themePreviewDescription",
-        )
-        description_label.setWordWrap(True)
-
-        text_layout.addWidget(title_label)
-        text_layout.addWidget(description_label)
-        text_widget = QWidget()
-        text_widget.setLayout(text_layout)
-
-        content_layout.addWidget(icon_label)
-        content_layout.addWidget(text_widget, 1)
-        content_layout.setAlignment(icon_label, Qt.AlignmentFlag.AlignVCenter)
-        content_layout.setAlignment(text_widget, Qt.AlignmentFlag.AlignVCenter)
-
-        idx = len(self.theme_buttons)
-        self.theme_buttons_group.addButton(button, idx)
-        self.theme_buttons[theme_name] = button
-        if theme_name == self.theme_name:
-            button.setChecked(True)
-        button.clicked.connect(lambda _, t=theme_name: self.on_theme_changed(t))
-        return button
-
-    def get_theme_preview_color(self, theme_colors: dict, keys, mode: int, fallback: str) -> QColor:
-        for key in keys:
-            color_data = theme_colors.get(key)
-            if not color_data or len(color_data) <= mode:
-                continue
-            color = QColor(color_data[mode])
-            if color.isValid():
-                return color
-        fallback_color = QColor(fallback)
-        if fallback_color.isValid():
-            return fallback_color
-        return QColor("#808080")
-
-    def build_theme_preview_icon(self, theme_name: str) -> QIcon:
-        theme_preview = get_theme(theme_name)
-        theme_colors = theme_preview.get("colors", {})
-        preview_mode = get_effective_color_mode()
-
-        canvas = self.get_theme_preview_color(theme_colors, ("CANVAS", "WINDOW_BG"), preview_mode, "#f5f5f5")
-        surface = self.get_theme_preview_color(theme_colors, ("CANVAS_ELEVATED", "FRAME_BG"), preview_mode, "#ffffff")
-        border = self.get_theme_preview_color(theme_colors, ("BORDER", "MEDIUM_BORDER"), preview_mode, "#c4c4c4")
-        fg = self.get_theme_preview_color(theme_colors, ("FG", "TEXT_FG"), preview_mode, "#111827")
-        subtle_fg = self.get_theme_preview_color(theme_colors, ("FG_SUBTLE", "FG_FAINT", "SLIGHTLY_GREY_TEXT"), preview_mode, "#6b7280")
-        primary = self.get_theme_preview_color(theme_colors, ("BUTTON_PRIMARY_BG", "BUTTON_FOCUS_BG"), preview_mode, "#3b82f6")
-        highlight = self.get_theme_preview_color(theme_colors, ("HIGHLIGHT_BG", "SELECTED_BG"), preview_mode, "#dbeafe")
-
-        pixmap = QPixmap(92, 56)
-        pixmap.fill(Qt.GlobalColor.transparent)
-        painter = QPainter(pixmap)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-
-        painter.setPen(QPen(border, 1))
-        painter.setBrush(canvas)
-        painter.drawRoundedRect(QRectF(1, 1, 90, 54), 8, 8)
-
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(surface)
-        painter.drawRoundedRect(QRectF(6, 6, 80, 44), 6, 6)
-
-        painter.setBrush(highlight)
-        painter.drawRoundedRect(QRectF(11, 12, 40, 6), 3, 3)
-        painter.drawRoundedRect(QRectF(11, 22, 26, 5), 2.5, 2.5)
-
-        painter.setBrush(primary)
-        painter.drawRoundedRect(QRectF(58, 12, 22, 10), 4, 4)
-        painter.drawRoundedRect(QRectF(58, 27, 22, 17), 4, 4)
-
-        painter.setPen(QPen(fg, 1.2))
-        painter.drawLine(QPointF(11, 35), QPointF(44, 35))
-        painter.setPen(QPen(subtle_fg, 1.2))
-        painter.drawLine(QPointF(11, 41), QPointF(39, 41))
-        painter.end()
-
-        return QIcon(pixmap)
+    def build_theme_preview_pixmap(self, theme_name: str) -> QPixmap:
+        entry = self.theme_manifest.get(theme_name, {})
+        mode_swatches = entry.get("swatches", {}).get(SWATCH_MODES[get_effective_color_mode()], {})
+        return render_theme_thumbnail(mode_swatches)
+
+    def get_preview_swatches(self) -> dict:
+        mode = SWATCH_MODES[get_effective_color_mode()]
+        return {name: entry.get("swatches", {}).get(mode) for name, entry in self.theme_manifest.items()}
 
     def refresh_theme_preview_icons(self) -> None:
-        for theme_name, icon_label in self.theme_preview_icon_labels.items():
-            icon_label.setPixmap(self.build_theme_preview_icon(theme_name).pixmap(92, 56))
+        # Picks up saved theme files; only thumbnails whose swatches changed re-render,
+        # lazily as their rows are painted.
+        self.theme_manifest = get_theme_manifest()
+        preview_swatches = self.get_preview_swatches()
+        changed = [
+            name for name, swatches in preview_swatches.items()
+            if swatches != self.preview_swatches.get(name)
+        ]
+        self.preview_swatches = preview_swatches
+        if changed:
+            self.theme_gallery.invalidate_thumbnails(changed)
 
     # === Color Picker Widgets ===
     def color_input(self, key: str) -> QWidget:
@@ -516,19 +612,19 @@ class AnkiRedesignConfigDialog(QDialog):
         field_layout.addWidget(value)
         field_layout.addStretch(1)
 
-        color_dialog = QColorDialog(self)
+        shown = {"value": None}
 
         def set_color(rgb: str) -> None:
-            color = QColor(rgb)
-            if not color.isValid():
+            shown["value"] = rgb
+            rgba = parse_color(rgb)
+            if rgba is None:
                 value.setText(str(rgb) if rgb else "invalid")
                 button.setStyleSheet(
                     'QPushButton{ background-color: "#f3f4f6"; border: 1px solid #9aa3b2; border-radius: 6px }'
                 )
                 return
 
-            hex_rgb = color.name(QColor.NameFormat.HexRgb).upper()
-            color_dialog.setCurrentColor(color)
+            hex_rgb = to_hex(rgba[:3] + (255,)).upper()
             value.setText(hex_rgb)
             button.setStyleSheet(
                 'QPushButton{ background-color: "%s"; border: 1px solid #9aa3b2; border-radius: 6px }' % hex_rgb
@@ -539,29 +635,60 @@ class AnkiRedesignConfigDialog(QDialog):
                 rgb = self.theme_colors.get(key)[color_mode]
             except:
                 rgb = "#ff0000"
-            set_color(rgb)
+            if rgb != shown["value"]:
+                set_color(rgb)
 
-        def save(color: QColor) -> None:
-            rgb = color.name(QColor.NameFormat.HexRgb)
+        def store(rgb: str) -> None:
             self.theme_colors[key][color_mode] = rgb
             if key == "CANVAS":
                 self.sync_bs_body_bg_with_canvas()
+
+        def save(color: QColor) -> None:
+            rgb = color.name(QColor.NameFormat.HexRgb)
+            store(rgb)
             set_color(rgb)
+            self.schedule_preview()
+
+        def preview(color: QColor) -> None:
+            if self.live_preview.isChecked():
+                store(color.name(QColor.NameFormat.HexRgb))
+                self.schedule_preview()
+
+        def pick() -> None:
+            original = self.theme_colors[key][color_mode]
+            color_dialog = self.get_color_dialog()
+            rgba = parse_color(original)
+            if rgba is not None:
+                color_dialog.setCurrentColor(QColor(*rgba))
+            self.color_preview = preview
+            accepted = color_dialog.exec()
+            self.color_preview = None
+            if accepted:
+                save(color_dialog.selectedColor())
+            elif self.theme_colors[key][color_mode] != original:
+                store(original)
+                set_color(original)
+                self.schedule_preview()
 
         self.updates.append(update)
         update()
-        color_dialog.colorSelected.connect(lambda color: save(color))
-        button.clicked.connect(lambda _: color_dialog.exec())
+        button.clicked.connect(lambda _: pick())
         return field
 
-    def create_color_picker_layout(self, colors) -> QLayout:
-        layout = QFormLayout()
+    def get_color_dialog(self) -> QColorDialog:
+        if self.color_dialog is None:
+            self.color_dialog = QColorDialog(self)
+            qconnect(self.color_dialog.currentColorChanged, self.on_picker_color_changed)
+        return self.color_dialog
+
+    def on_picker_color_changed(self, color: QColor) -> None:
+        if self.color_preview is not None:
+            self.color_preview(color)
+
+    def create_color_picker_layout(self, layout: QFormLayout) -> QLayout:
         layout.setContentsMargins(24, 20, 24, 20)
         layout.setHorizontalSpacing(18)
         layout.setVerticalSpacing(10)
-        for key in colors:
-            label = QLabel(self.theme_colors.get(key)[0])
-            layout.addRow(label, self.color_input(key))
 
         wrapper = QVBoxLayout()
         wrapper.setContentsMargins(0, 0, 0, 0)
@@ -586,6 +713,7 @@ class AnkiRedesignConfigDialog(QDialog):
         themes_parsed = get_system_theme(self.theme_name)
         self.theme_colors = themes_parsed.get("colors")
         self.refresh_color_inputs()
+        self.schedule_preview()
         showInfo(self.texts["reset_colors_notice"])
 
     # === Buttons ===
@@ -605,7 +733,7 @@ class AnkiRedesignConfigDialog(QDialog):
         def cancel():
             button = QPushButton(self.texts["cancel_button"])
             button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-            qconnect(button.clicked, self.accept)
+            qconnect(button.clicked, self.reject)
             return button
 
         def save():
@@ -639,8 +767,10 @@ class AnkiRedesignConfigDialog(QDialog):
             self.match_card_template_background_to_theme.isChecked()
         )
         config["font_customization_enabled"] = self.enable_font_customization.isChecked()
-        config["font"] = self.interface_font.currentFont().family()
+        config["font"] = self.interface_font.current_family() or config["font"]
         config["font_size"] = self.font_size.value()
+        config["live_preview"] = self.live_preview.isChecked()
+        config["performance_mode"] = self.performance_mode.isChecked()
         config["theme_name"] = normalize_theme_name(self.theme_name)
         write_config(config)
         config = get_config()
@@ -650,208 +780,80 @@ class AnkiRedesignConfigDialog(QDialog):
         self.sync_bs_body_bg_with_canvas()
         themes_parsed["colors"] = self.theme_colors
         write_theme(ensure_user_theme(config["theme_name"]), themes_parsed)
+        self.end_preview(revert=False)
         update_theme()
-
-        if config.get("show_restart_notice", True):
-            popup = QMessageBox(self)
-            popup.setIcon(QMessageBox.Icon.Information)
-            popup.setWindowTitle(self.texts.get("configuration_window_title", "Anki Redesign Configuration"))
-            popup.setText(self.texts["changes_message"])
-            popup.setStandardButtons(QMessageBox.StandardButton.Ok)
-            dont_show_again = QCheckBox(
-                self.texts.get("dont_show_restart_notice", "Don't show this again.")
-            )
-            popup.setCheckBox(dont_show_again)
-            popup.exec()
-            if dont_show_again.isChecked():
-                config["show_restart_notice"] = False
-                write_config(config)
-                config = get_config()
         self.accept()
-# === Theme Application Utilities ===
-
-# === Palette Helpers ===
-def check_legacy_colors() -> None:
-    try:
-        _ = colors.items()
-    except:
-        return False
-    return True
-
-
-# === UI Refresh ===
-def refresh_all_windows() -> None:
-    # Redraw top toolbar
-    mw.toolbar.draw()
-    if attribute_exists(gui_hooks, "top_toolbar_did_init_links"):
-        gui_hooks.top_toolbar_did_init_links.append(lambda a, b: [redraw_toolbar_legacy(a, b), gui_hooks.top_toolbar_did_init_links.remove(print)])
-
-    # Redraw main body
-    if mw.state == "review":
-        mw.reviewer._initWeb()
-        # Legacy check
-        if getattr(mw.reviewer, "_redraw_current_card", False):
-            mw.reviewer._redraw_current_card()
-            mw.fade_in_webview()
-    elif mw.state == "overview":
-        mw.overview.refresh()
-    elif mw.state == "deckBrowser":
-        mw.deckBrowser.show()
-
-    # Redraw toolbar
-    if attribute_exists(gui_hooks, "top_toolbar_did_init_links"):
-        gui_hooks.top_toolbar_did_init_links.remove(redraw_toolbar)
-
-
-# === Theme Application ===
-def update_theme() -> None:
-    global themes_parsed, color_mode
-    config_data = get_config()
-    theme_name = get_active_theme_name(config_data)
-    themes_parsed = get_theme(theme_name)
-    theme_colors = themes_parsed.get("colors")
-    light = LIGHT_COLOR_MODE
-    dark = DARK_COLOR_MODE
-    color_mode = get_effective_color_mode()
-    day_mode = light
-    night_mode = dark
-    # Apply theme on colors
-    ncolors = {}
-    # Legacy color check
-    # logger.debug(dir(colors))
-    legacy = check_legacy_colors()
-    for color_name in theme_colors:
-        c = theme_colors.get(color_name)
-        ncolors[color_name] = c[color_mode]
-        if legacy:
-            colors[f"day{c[3].replace('--','-')}"] = c[day_mode]
-            colors[f"night{c[3].replace('--','-')}"] = c[night_mode]
-        else:
-            if getattr(colors, color_name, False):
-                if pointVersion() >= 56:
-                    setattr(colors, color_name, {"light": c[day_mode], "dark": c[night_mode]})
-                else:
-                    setattr(colors, color_name, (c[day_mode], c[night_mode]))
-    apply_theme(ncolors)
-    gui_hooks.debug_console_will_show(mw)
-    refresh_all_windows()
-
-
-# === Palette Application ===
-def apply_theme(colors) -> None:
-    logger.debug(colors)
-    if getattr(theme_manager, "_default_style", False):
-        mw.app.setStyle(QStyleFactory.create(theme_manager._default_style))
-        if getattr(theme_manager, "default_palette", False):
-            mw.app.setPalette(theme_manager.default_palette)
-        else:
-            theme_manager._apply_palette(mw.app)
-    palette = QPalette()
-    if pointVersion() >= 56:
-        text = QColor(colors["FG"])
-        palette.setColor(QPalette.ColorRole.WindowText, text)
-        palette.setColor(QPalette.ColorRole.ToolTipText, text)
-        palette.setColor(QPalette.ColorRole.Text, text)
-        palette.setColor(QPalette.ColorRole.ButtonText, text)
-
-        hlbg = QColor(colors["HIGHLIGHT_BG"])
-        palette.setColor(QPalette.ColorRole.HighlightedText, QColor(colors["HIGHLIGHT_FG"]))
-        palette.setColor(QPalette.ColorRole.Highlight, hlbg)
-
-        canvas = QColor(colors["CANVAS"])
-        palette.setColor(QPalette.ColorRole.Window, canvas)
-        palette.setColor(QPalette.ColorRole.AlternateBase, canvas)
-
-        palette.setColor(QPalette.ColorRole.Button, QColor(colors["BUTTON_BG"]))
-
-        input_base = QColor(colors["CANVAS_CODE"])
-        palette.setColor(QPalette.ColorRole.Base, input_base)
-        palette.setColor(QPalette.ColorRole.ToolTipBase, input_base)
-
-        palette.setColor(QPalette.ColorRole.PlaceholderText, QColor(colors["FG_SUBTLE"]))
-
-        disabled_color = QColor(colors["FG_DISABLED"])
-        palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.Text, disabled_color)
-        palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.ButtonText, disabled_color)
-        palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.HighlightedText, disabled_color)
-        palette.setColor(QPalette.ColorRole.Link, QColor(colors["FG_LINK"]))
-        palette.setColor(QPalette.ColorRole.BrightText, Qt.GlobalColor.red)
-
-        # Update webview background
-        AnkiWebView._getWindowColor = lambda *args: QColor(colors["CANVAS"])
-        AnkiWebView.get_window_bg_color = lambda *args: QColor(colors["CANVAS"])
-
-        theme_manager._apply_palette(mw.app)  # Update palette theme_manager
-        mw.app.setPalette(palette)  # Overwrite palette
-        theme_manager._apply_style(mw.app)  # Update stylesheet theme_manager
-    else:
-        color_map = {
-            QPalette.ColorRole.Window: "WINDOW_BG",
-            QPalette.ColorRole.WindowText: "TEXT_FG",
-            QPalette.ColorRole.Base: "FRAME_BG",
-            QPalette.ColorRole.AlternateBase: "WINDOW_BG",
-            QPalette.ColorRole.ToolTipBase: "TOOLTIP_BG",
-            QPalette.ColorRole.ToolTipText: "TEXT_FG",
-            QPalette.ColorRole.Text: "TEXT_FG",
-            QPalette.ColorRole.Button: "BUTTON_BG",
-            QPalette.ColorRole.ButtonText: "TEXT_FG",
-            QPalette.ColorRole.BrightText: "HIGHLIGHT_FG",
-            QPalette.ColorRole.HighlightedText: "HIGHLIGHT_FG",
-            QPalette.ColorRole.Link: "LINK",
-            QPalette.ColorRole.NoRole: "WINDOW_BG",
-        }
-        for color_role in color_map:
-            palette.setColor(color_role, QColor(colors[color_map[color_role]]))
-
-        highlight_bg = QColor(colors["HIGHLIGHT_BG"])
-        highlight_bg.setAlpha(64)
-        palette.setColor(QPalette.ColorRole.Highlight, highlight_bg)
-
-        disabled_color = QColor(colors["DISABLED"])
-        palette.setColor(QPalette.ColorRole.PlaceholderText, disabled_color)
-        palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.Text, disabled_color)
-        palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.ButtonText, disabled_color)
-        palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.HighlightedText, disabled_color)
-
-        # Update webview background
-        AnkiWebView._getWindowColor = lambda *args: QColor(colors["WINDOW_BG"])
-        AnkiWebView.get_window_bg_color = lambda *args: QColor(colors["WINDOW_BG"])
-
-        theme_manager._apply_palette(mw.app)  # Update palette theme_manager
-        mw.app.setPalette(palette)  # Overwrite palette
-        theme_manager._apply_style(mw.app)  # Update stylesheet theme_manager
-
-
-# === Menu Wiring ===
-def create_menu_action(parent: QWidget, dialog_class: QDialog, dialog_name: str) -> QAction:
-    def open_dialog():
-        dialog = dialog_class(mw)
-        return dialog.exec()
-
-    action = QAction(dialog_name, parent)
-    action.triggered.connect(open_dialog)
-    return action
-
-
-# === Menu Registration ===
-if not hasattr(mw, 'anki_redesign'):
-    mw.form.menuTools.addAction(create_menu_action(mw, AnkiRedesignConfigDialog, "Anki Redesign+"))
-    mw.reset()
-    update_theme()
-    if 'Qt6' in QPalette.ColorRole.__module__:
-        logger.debug('QT6 detected...')
-        mw.reset()
-        update_theme()
-
-
-# === Theme Change Hook ===
-def on_theme_did_change() -> None:
-    global color_mode
-    color_mode = get_effective_color_mode()
-    logger.debug("Theme changed")
-    mw.reset()
-    update_theme()
 
 
-if attribute_exists(gui_hooks, "theme_did_change"):
-    gui_hooks.theme_did_change.append(on_theme_did_change)
+# === Config Dialog Instance ===
+# The config dialog is built once and hidden between uses.
+_config_dialog = None
+# (dialog, remaining build steps) while the prewarm scheduler is building it.
+_pending_build = None
+
+
+def get_config_dialog() -> AnkiRedesignConfigDialog:
+    global _config_dialog, _pending_build
+    if _config_dialog is None:
+        with perf.measure("config_dialog/build"):
+            if _pending_build is None:
+                _config_dialog = AnkiRedesignConfigDialog(mw)
+            else:
+                # Opened mid-prewarm: finish the partly built dialog instead of starting over.
+                dialog, steps = _pending_build
+                for _ in steps:
+                    pass
+                _config_dialog = dialog
+                _pending_build = None
+    return _config_dialog
+
+
+def build_config_dialog_steps():
+    """Build the shared config dialog one step per ``yield``, for the prewarm scheduler."""
+    global _config_dialog, _pending_build
+    if _config_dialog is not None or _pending_build is not None:
+        return
+    dialog = AnkiRedesignConfigDialog(mw, build=False)
+    steps = dialog.build_steps()
+    _pending_build = (dialog, steps)
+    for _ in steps:
+        yield
+    if _pending_build is not None and _pending_build[0] is dialog:
+        _config_dialog = dialog
+        _pending_build = None
+
+
+def open_config_dialog() -> None:
+    if _config_dialog is not None and _config_dialog.isVisible():
+        _config_dialog.raise_()
+        _config_dialog.activateWindow()
+        return
+    dialog = get_config_dialog()
+    with perf.measure("config_dialog/sync"):
+        dialog.sync_with_config()
+    dialog.exec()
+
+
+# === Leak Check Steps ===
+def get_leak_check_dialog() -> "AnkiRedesignConfigDialog":
+    # A private dialog under the leak check sandbox, so the shared one is never touched.
+    sandbox = leak_check_parent()
+    if getattr(sandbox, "config_dialog", None) is None:
+        sandbox.config_dialog = AnkiRedesignConfigDialog(sandbox)
+    return sandbox.config_dialog
+
+
+def leak_check_config_dialog() -> None:
+    dialog = get_leak_check_dialog()
+    dialog.sync_with_config()
+    dialog.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, True)
+    dialog.show()
+    dialog.hide()
+    dialog.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, False)
+
+
+def leak_check_theme_editor() -> None:
+    dialog = get_leak_check_dialog()
+    editor = AnkiRedesignThemeEditor(dialog, dialog.theme_name)
+    editor.reject()
+    editor.deleteLater()
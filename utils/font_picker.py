@@ -0,0 +1,92 @@
+from aqt import mw
+from aqt.qt import *
+
+from .capabilities import capabilities
+from .logger import logger
+from .perf import perf
+
+# === Font Families ===
+# Installed families, enumerated once per process.
+_font_families = None
+
+
+def list_font_families() -> list:
+    global _font_families
+    if _font_families is None:
+        with perf.measure("list_font_families"):
+            if capabilities.qt6:
+                families = QFontDatabase.families()
+            else:
+                families = QFontDatabase().families()
+            _font_families = list(families)
+    return _font_families
+
+
+def font_families_ready() -> bool:
+    return _font_families is not None
+
+
+# === Font Picker ===
+class LazyFontComboBox(QComboBox):
+    """Editable font picker that shows the saved family as text and only
+    enumerates installed fonts when it is first focused or expanded."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setEditable(True)
+        self.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        self.families_loaded = False
+        self.loading = False
+        self.popup_pending = False
+
+    def current_family(self) -> str:
+        return self.currentText().strip()
+
+    def set_current_family(self, family: str) -> None:
+        index = self.findText(family, Qt.MatchFlag.MatchFixedString) if self.families_loaded else -1
+        if index >= 0:
+            self.setCurrentIndex(index)
+        else:
+            self.setEditText(family)
+
+    def focusInEvent(self, event: QFocusEvent) -> None:
+        self.load_families()
+        super().focusInEvent(event)
+
+    def showPopup(self) -> None:
+        if self.families_loaded:
+            super().showPopup()
+            return
+        self.popup_pending = True
+        self.load_families()
+
+    def load_families(self) -> None:
+        if self.families_loaded or self.loading:
+            return
+        if font_families_ready() or not capabilities.qt6:
+            # Qt5's QFontDatabase is not safe to use off the GUI thread.
+            self.fill_families(list_font_families())
+            return
+        self.loading = True
+        mw.taskman.run_in_background(list_font_families, self.on_families_loaded)
+
+    def on_families_loaded(self, future) -> None:
+        self.loading = False
+        try:
+            families = future.result()
+        except Exception as error:
+            logger.debug(f"Font enumeration failed: {error}")
+            families = []
+        self.fill_families(families)
+
+    def fill_families(self, families: list) -> None:
+        family = self.current_family()
+        self.blockSignals(True)
+        self.clear()
+        self.addItems(families)
+        self.families_loaded = True
+        self.set_current_family(family)
+        self.blockSignals(False)
+        if self.popup_pending:
+            self.popup_pending = False
+            super().showPopup()
@@ -0,0 +1,38 @@
+from typing import Callable, List
+
+# === Add-on Hooks ===
+# Mirrors the shape of aqt's generated hooks so other add-ons can subscribe with
+# append()/remove(), e.g. mw.anki_redesign.theme_did_apply.append(callback).
+
+
+class _ThemeDidApplyHook:
+    """Called after a theme has been applied to the running UI.
+
+    Receives the already-loaded theme dict and the color mode that was applied
+    (2 for light, 3 for dark), so receivers never need to reload the theme.
+    """
+
+    _hooks: List[Callable[[dict, int], None]] = []
+
+    def append(self, callback: Callable[[dict, int], None]) -> None:
+        """(theme: dict, color_mode: int)"""
+        self._hooks.append(callback)
+
+    def remove(self, callback: Callable[[dict, int], None]) -> None:
+        if callback in self._hooks:
+            self._hooks.remove(callback)
+
+    def count(self) -> int:
+        return len(self._hooks)
+
+    def __call__(self, theme: dict, color_mode: int) -> None:
+        for hook in self._hooks:
+            try:
+                hook(theme, color_mode)
+            except:
+                # if the hook fails, remove it
+                self._hooks.remove(hook)
+                raise
+
+
+theme_did_apply = _ThemeDidApplyHook()
@@ -0,0 +1,160 @@
+import concurrent.futures
+import gc
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from aqt import mw
+from aqt.qt import QApplication, QCoreApplication, QEvent, QEventLoop, QObject, Qt, QWidget
+
+from .hooks import theme_did_apply
+from .perf import perf
+from .styled_registry import restyling_suspended
+
+# === Leak Check Budgets ===
+LEAK_CHECK_CYCLES = 100
+# Growth allowed across all cycles, measured after one warm-up cycle has filled the caches.
+QOBJECT_BUDGET = 25
+MEMORY_BUDGET_KB = 1024
+
+# Steps registered by the modules that own the code under test; each runs once per cycle.
+_steps = {}
+
+
+def register_leak_check_step(name: str, step: Callable[[], None]) -> None:
+    _steps[name] = step
+
+
+# Shared caches the steps write to, as functions returning the cache dict.
+_caches = {}
+
+
+def register_leak_check_cache(name: str, get_cache: Callable[[], dict]) -> None:
+    _caches[name] = get_cache
+
+
+# === Isolation ===
+# The add-on's package; subscribers defined in it or its submodules stay attached.
+ADDON_MODULE = __name__.rsplit(".", 2)[0]
+BACKGROUND_TASK_TIMEOUT_S = 30
+
+# Hidden top-level widget that steps parent their objects to instead of mw; it is
+# deleted, with everything under it, when the check ends.
+_sandbox = None
+# Futures of background tasks started while the check runs.
+_background_tasks = []
+
+
+def leak_check_parent() -> Optional[QWidget]:
+    return _sandbox
+
+
+def is_addon_callback(callback: Callable) -> bool:
+    module = getattr(callback, "__module__", None) or ""
+    return module == ADDON_MODULE or module.startswith(f"{ADDON_MODULE}.")
+
+
+@contextmanager
+def isolated_from_session():
+    """Keep the cycles away from the rest of the running session.
+
+    Steps build their objects under a hidden sandbox widget rather than mw. Other
+    add-ons' theme_did_apply subscribers are detached, registered windows and webviews
+    are not restyled, background tasks are tracked so they can be waited for, and every
+    registered cache starts empty and gets its original contents back afterwards.
+    """
+    global _sandbox
+    _sandbox = QWidget()
+    _sandbox.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, True)
+    run_in_background = mw.taskman.run_in_background
+
+    def tracked_run_in_background(*args, **kwargs):
+        future = run_in_background(*args, **kwargs)
+        _background_tasks.append(future)
+        return future
+
+    mw.taskman.run_in_background = tracked_run_in_background
+    hooks = theme_did_apply._hooks
+    saved_hooks = list(hooks)
+    hooks[:] = [hook for hook in hooks if is_addon_callback(hook)]
+    saved_caches = {}
+    for name, get_cache in _caches.items():
+        cache = get_cache()
+        saved_caches[name] = (cache, dict(cache))
+        cache.clear()
+    try:
+        with restyling_suspended():
+            yield
+    finally:
+        for cache, contents in saved_caches.values():
+            cache.clear()
+            cache.update(contents)
+        hooks[:] = saved_hooks
+        mw.taskman.run_in_background = run_in_background
+        _background_tasks.clear()
+        _sandbox.deleteLater()
+        _sandbox = None
+
+
+def count_qobjects() -> int:
+    sandboxed = len(_sandbox.findChildren(QObject)) if _sandbox is not None else 0
+    return len(mw.findChildren(QObject)) + len(QApplication.topLevelWidgets()) + sandboxed
+
+
+perf.add_gauge("qt_objects", count_qobjects)
+
+
+def _settle() -> None:
+    # Pending validations still hold their inputs, and their done callbacks run on the
+    # main thread, so both have to finish before memory is sampled.
+    concurrent.futures.wait(_background_tasks, timeout=BACKGROUND_TASK_TIMEOUT_S)
+    _background_tasks.clear()
+    QCoreApplication.processEvents(QEventLoop.ProcessEventsFlag.ExcludeUserInputEvents)
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    gc.collect()
+
+
+# === Leak Check ===
+def run_leak_check(cycles: int = LEAK_CHECK_CYCLES) -> dict:
+    """Run every registered step ``cycles`` times and compare retained growth to the budgets.
+
+    A manual diagnostic, started from the diagnostics dialog; it needs a running Anki.
+    """
+    with isolated_from_session():
+        for step in _steps.values():
+            step()
+        _settle()
+
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        qobjects_before = count_qobjects()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        with perf.measure("leak_check"):
+            for _ in range(cycles):
+                for step in _steps.values():
+                    step()
+                QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        _settle()
+        memory_growth_kb = (tracemalloc.get_traced_memory()[0] - memory_before) / 1024
+        qobject_growth = count_qobjects() - qobjects_before
+        if not was_tracing:
+            tracemalloc.stop()
+
+    return {
+        "cycles": cycles,
+        "steps": list(_steps),
+        "qobject_growth": qobject_growth,
+        "qobject_budget": QOBJECT_BUDGET,
+        "memory_growth_kb": round(memory_growth_kb, 1),
+        "memory_budget_kb": MEMORY_BUDGET_KB,
+        "passed": qobject_growth <= QOBJECT_BUDGET and memory_growth_kb <= MEMORY_BUDGET_KB,
+    }
+
+
+def format_leak_check(result: dict) -> str:
+    return "\n".join([
+        f"{'PASSED' if result['passed'] else 'FAILED'} after {result['cycles']} cycles of: {', '.join(result['steps'])}",
+        f"Qt objects: {result['qobject_growth']:+d} (budget {result['qobject_budget']})",
+        f"Python memory: {result['memory_growth_kb']:+.1f} KB (budget {result['memory_budget_kb']} KB)",
+    ])
@@ -1,21 +1,40 @@
+import importlib
+import importlib.util
+
 # === Module Utilities ===
 def module_exists(module_name):
+    # Finds the module without executing it; only its parent packages get imported.
     try:
-        __import__(module_name)
-    except ImportError:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
         return False
-    else:
-        return True
 
 # === Attribute Utilities ===
 def module_has_attribute(module_name, attribute):
-    if module_exists(module_name):
-        return hasattr(__import__(module_name), attribute)
-    return False
+    return resolve_attribute(module_name, attribute) is not None
+
+# Attributes looked up by resolve_attribute(), None when the module or attribute is missing.
+_resolved_attributes = {}
+
+def resolve_attribute(module_name, attribute):
+    """Import ``module_name`` on first use and return its ``attribute``, or None."""
+    key = (module_name, attribute)
+    if key not in _resolved_attributes:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            module = None
+        _resolved_attributes[key] = getattr(module, attribute, None)
+    return _resolved_attributes[key]
 
 def attribute_exists(object, attribute):
     return attribute in object.__dict__
 
+# === Hook Utilities ===
+def append_hook_once(hook, callback):
+    if callback not in getattr(hook, "_hooks", []):
+        hook.append(callback)
+
 # === Context Utilities ===
 def context_name_includes(context, classname):
     return classname in str(context.__class__)
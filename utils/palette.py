@@ -0,0 +1,115 @@
+from aqt.qt import QColor, QPalette, Qt
+from aqt.webview import AnkiWebView
+
+from .capabilities import capabilities
+from .perf import perf
+
+# === Palette Cache ===
+# Keyed by (theme hash, color mode); values are (QPalette, window background QColor).
+# Every saved edit makes a new theme hash, so the cache is cleared once it grows past the limit.
+PALETTE_CACHE_LIMIT = 32
+_palette_cache = {}
+perf.add_gauge("cache_size/palette", lambda: len(_palette_cache))
+_window_bg_color = QColor("#808080")
+
+LEGACY_PALETTE_ROLES = {
+    QPalette.ColorRole.Window: "WINDOW_BG",
+    QPalette.ColorRole.WindowText: "TEXT_FG",
+    QPalette.ColorRole.Base: "FRAME_BG",
+    QPalette.ColorRole.AlternateBase: "WINDOW_BG",
+    QPalette.ColorRole.ToolTipBase: "TOOLTIP_BG",
+    QPalette.ColorRole.ToolTipText: "TEXT_FG",
+    QPalette.ColorRole.Text: "TEXT_FG",
+    QPalette.ColorRole.Button: "BUTTON_BG",
+    QPalette.ColorRole.ButtonText: "TEXT_FG",
+    QPalette.ColorRole.BrightText: "HIGHLIGHT_FG",
+    QPalette.ColorRole.HighlightedText: "HIGHLIGHT_FG",
+    QPalette.ColorRole.Link: "LINK",
+    QPalette.ColorRole.NoRole: "WINDOW_BG",
+}
+
+
+# === Palette Construction ===
+def to_qcolor(value) -> QColor:
+    # Values are pre-parsed (r, g, b, a) tuples; raw strings only for invalid entries.
+    if isinstance(value, tuple):
+        return QColor(*value)
+    return QColor(value)
+
+
+def build_palette(colors: dict) -> tuple:
+    palette = QPalette()
+    if capabilities.modern_theme:
+        text = to_qcolor(colors["FG"])
+        palette.setColor(QPalette.ColorRole.WindowText, text)
+        palette.setColor(QPalette.ColorRole.ToolTipText, text)
+        palette.setColor(QPalette.ColorRole.Text, text)
+        palette.setColor(QPalette.ColorRole.ButtonText, text)
+
+        hlbg = to_qcolor(colors["HIGHLIGHT_BG"])
+        palette.setColor(QPalette.ColorRole.HighlightedText, to_qcolor(colors["HIGHLIGHT_FG"]))
+        palette.setColor(QPalette.ColorRole.Highlight, hlbg)
+
+        canvas = to_qcolor(colors["CANVAS"])
+        palette.setColor(QPalette.ColorRole.Window, canvas)
+        palette.setColor(QPalette.ColorRole.AlternateBase, canvas)
+
+        palette.setColor(QPalette.ColorRole.Button, to_qcolor(colors["BUTTON_BG"]))
+
+        input_base = to_qcolor(colors["CANVAS_CODE"])
+        palette.setColor(QPalette.ColorRole.Base, input_base)
+        palette.setColor(QPalette.ColorRole.ToolTipBase, input_base)
+
+        palette.setColor(QPalette.ColorRole.PlaceholderText, to_qcolor(colors["FG_SUBTLE"]))
+
+        disabled_color = to_qcolor(colors["FG_DISABLED"])
+        palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.Text, disabled_color)
+        palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.ButtonText, disabled_color)
+        palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.HighlightedText, disabled_color)
+        palette.setColor(QPalette.ColorRole.Link, to_qcolor(colors["FG_LINK"]))
+        palette.setColor(QPalette.ColorRole.BrightText, Qt.GlobalColor.red)
+        return palette, canvas
+
+    for color_role, color_name in LEGACY_PALETTE_ROLES.items():
+        palette.setColor(color_role, to_qcolor(colors[color_name]))
+
+    highlight_bg = to_qcolor(colors["HIGHLIGHT_BG"])
+    highlight_bg.setAlpha(64)
+    palette.setColor(QPalette.ColorRole.Highlight, highlight_bg)
+
+    disabled_color = to_qcolor(colors["DISABLED"])
+    palette.setColor(QPalette.ColorRole.PlaceholderText, disabled_color)
+    palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.Text, disabled_color)
+    palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.ButtonText, disabled_color)
+    palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.HighlightedText, disabled_color)
+    return palette, to_qcolor(colors["WINDOW_BG"])
+
+
+def get_palette(theme_hash: str, mode: int, colors: dict) -> tuple:
+    key = (theme_hash, mode)
+    cached = _palette_cache.get(key)
+    perf.count_cache("palette", cached is not None)
+    if cached is None:
+        cached = build_palette(colors)
+        if len(_palette_cache) >= PALETTE_CACHE_LIMIT:
+            _palette_cache.clear()
+        _palette_cache[key] = cached
+    return cached
+
+
+def clear_palette_cache() -> None:
+    _palette_cache.clear()
+
+
+# === Webview Background ===
+def get_window_bg_color(*_) -> QColor:
+    return _window_bg_color
+
+
+def set_window_bg_color(color: QColor) -> None:
+    global _window_bg_color
+    _window_bg_color = color
+    # Installed once; later calls only swap the cached color.
+    if getattr(AnkiWebView, "get_window_bg_color", None) is not get_window_bg_color:
+        AnkiWebView._getWindowColor = get_window_bg_color
+        AnkiWebView.get_window_bg_color = get_window_bg_color
@@ -0,0 +1,117 @@
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable
+
+# === Latency Histogram ===
+# Upper bounds in milliseconds; the last bucket collects everything slower.
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class PerfStats:
+    """In-process counters, latency histograms, cache hit rates and gauges for the add-on."""
+
+    def __init__(self) -> None:
+        self.started_at = time.time()
+        self.timings = {}
+        self.caches = {}
+        # Gauges are read when a snapshot is taken and survive reset().
+        self.gauges = {}
+        # Gauge name -> limit; snapshots list every gauge above its limit.
+        self.budgets = {}
+        # Prewarm and other background tasks record from worker threads.
+        self.lock = threading.Lock()
+
+    # === Recording ===
+    def record(self, name: str, elapsed_ms: float) -> None:
+        with self.lock:
+            timing = self.timings.get(name)
+            if timing is None:
+                timing = {
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "histogram": [0] * (len(HISTOGRAM_BUCKETS_MS) + 1),
+                }
+                self.timings[name] = timing
+            timing["count"] += 1
+            timing["total_ms"] += elapsed_ms
+            timing["max_ms"] = max(timing["max_ms"], elapsed_ms)
+            for idx, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    timing["histogram"][idx] += 1
+                    break
+            else:
+                timing["histogram"][-1] += 1
+
+    @contextmanager
+    def measure(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def timed(self, name: str):
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.measure(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count_cache(self, name: str, hit: bool) -> None:
+        with self.lock:
+            cache = self.caches.setdefault(name, {"hits": 0, "misses": 0})
+            cache["hits" if hit else "misses"] += 1
+
+    def add_gauge(self, name: str, read: Callable[[], int]) -> None:
+        self.gauges[name] = read
+
+    def set_budget(self, gauge_name: str, limit: float) -> None:
+        self.budgets[gauge_name] = limit
+
+    def read_gauges(self) -> dict:
+        values = {}
+        for name, read in self.gauges.items():
+            try:
+                values[name] = read()
+            except Exception:
+                values[name] = None
+        return values
+
+    # === Reporting ===
+    def reset(self) -> None:
+        with self.lock:
+            self.started_at = time.time()
+            self.timings.clear()
+            self.caches.clear()
+
+    def snapshot(self) -> dict:
+        timings = {}
+        caches = {}
+        with self.lock:
+            for name, timing in self.timings.items():
+                timings[name] = dict(timing, mean_ms=timing["total_ms"] / timing["count"], histogram=list(timing["histogram"]))
+            for name, cache in self.caches.items():
+                lookups = cache["hits"] + cache["misses"]
+                caches[name] = dict(cache, hit_rate=cache["hits"] / lookups if lookups else 0.0)
+        gauges = self.read_gauges()
+        over_budget = {
+            name: {"value": gauges[name], "budget": limit}
+            for name, limit in self.budgets.items()
+            if gauges.get(name) is not None and gauges[name] > limit
+        }
+        return {
+            "since": self.started_at,
+            "histogram_buckets_ms": list(HISTOGRAM_BUCKETS_MS),
+            "timings": timings,
+            "caches": caches,
+            "gauges": gauges,
+            "over_budget": over_budget,
+        }
+
+
+perf = PerfStats()
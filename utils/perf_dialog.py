@@ -0,0 +1,183 @@
+import json
+import time
+
+from aqt import mw
+from aqt.qt import *
+from aqt.utils import tooltip
+
+from .capabilities import capabilities
+from .dark_title_bar import dwmapi, set_dark_titlebar_qt
+from .leak_check import format_leak_check, run_leak_check
+from .perf import HISTOGRAM_BUCKETS_MS, perf
+from .render_benchmark import RenderBenchmark, format_benchmark, save_benchmark, set_benchmark_baseline
+
+# === Dialog Constants ===
+REFRESH_INTERVAL_MS = 1000
+TIMING_COLUMNS = ["Operation", "Calls", "Mean (ms)", "Max (ms)", "Total (ms)", "Histogram"]
+CACHE_COLUMNS = ["Cache", "Hits", "Misses", "Hit rate"]
+GAUGE_COLUMNS = ["Gauge", "Value"]
+
+
+def format_histogram(histogram: list) -> str:
+    labels = [f"≤{bound}" for bound in HISTOGRAM_BUCKETS_MS] + [f">{HISTOGRAM_BUCKETS_MS[-1]}"]
+    return "  ".join(f"{label}:{count}" for label, count in zip(labels, histogram) if count)
+
+
+# === Diagnostics Dialog ===
+class AnkiRedesignPerformanceDialog(QDialog):
+    """Live view of the add-on's own overhead; opened with Shift held on the Tools menu."""
+
+    def __init__(self, parent: QWidget, *args, **kwargs):
+        super().__init__(parent=parent or mw, *args, **kwargs)
+        self.setWindowTitle("Anki Redesign+ Diagnostics")
+        self.resize(760, 480)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        set_dark_titlebar_qt(self, dwmapi, fix=False)
+
+        self.root_layout = QVBoxLayout(self)
+        self.budget_label = QLabel()
+        self.budget_label.setWordWrap(True)
+        self.budget_label.setStyleSheet("QLabel { color: #dc2626 }")
+        self.root_layout.addWidget(self.budget_label)
+        self.timings_table = self.make_table(TIMING_COLUMNS)
+        self.caches_table = self.make_table(CACHE_COLUMNS)
+        self.gauges_table = self.make_table(GAUGE_COLUMNS)
+        self.last_leak_check = None
+        self.last_render_benchmark = None
+        self.render_benchmark_runner = None
+        self.root_layout.addWidget(self.timings_table, 3)
+        tables_row = QHBoxLayout()
+        tables_row.addWidget(self.caches_table)
+        tables_row.addWidget(self.gauges_table)
+        self.root_layout.addLayout(tables_row, 1)
+        self.root_layout.addLayout(self.make_button_box())
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        qconnect(self.refresh_timer.timeout, self.refresh)
+        self.refresh_timer.start()
+        self.refresh()
+
+    def make_table(self, columns: list) -> QTableWidget:
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    def fill_table(self, table: QTableWidget, rows: list) -> None:
+        table.setRowCount(len(rows))
+        for row_idx, row in enumerate(rows):
+            for col_idx, value in enumerate(row):
+                table.setItem(row_idx, col_idx, QTableWidgetItem(str(value)))
+        table.resizeColumnsToContents()
+
+    def refresh(self) -> None:
+        snapshot = perf.snapshot()
+        timing_rows = []
+        for name, timing in sorted(snapshot["timings"].items()):
+            timing_rows.append([
+                name,
+                timing["count"],
+                f"{timing['mean_ms']:.2f}",
+                f"{timing['max_ms']:.2f}",
+                f"{timing['total_ms']:.1f}",
+                format_histogram(timing["histogram"]),
+            ])
+        cache_rows = []
+        for name, cache in sorted(snapshot["caches"].items()):
+            cache_rows.append([name, cache["hits"], cache["misses"], f"{cache['hit_rate']:.0%}"])
+        gauge_rows = [[name, value] for name, value in sorted(snapshot["gauges"].items())]
+        over_budget = snapshot["over_budget"]
+        self.budget_label.setText("\n".join(
+            f"{name} is {entry['value']}, over its budget of {entry['budget']}"
+            for name, entry in sorted(over_budget.items())
+        ))
+        self.budget_label.setVisible(bool(over_budget))
+        self.fill_table(self.timings_table, timing_rows)
+        self.fill_table(self.caches_table, cache_rows)
+        self.fill_table(self.gauges_table, gauge_rows)
+
+    def reset(self) -> None:
+        perf.reset()
+        self.refresh()
+
+    def export(self) -> None:
+        filename, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Diagnostics",
+            f"anki-redesign-diagnostics-{time.strftime('%Y%m%d-%H%M%S')}.json",
+            "JSON (*.json)",
+        )
+        if not filename:
+            return
+        snapshot = perf.snapshot()
+        snapshot["exported_at"] = time.time()
+        snapshot["capabilities"] = capabilities.as_dict()
+        snapshot["leak_check"] = self.last_leak_check
+        snapshot["render_benchmark"] = self.last_render_benchmark
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=2, sort_keys=True)
+        tooltip(f"Saved {filename}", parent=self)
+
+    def leak_check(self) -> None:
+        QApplication.setOverrideCursor(QCursor(Qt.CursorShape.WaitCursor))
+        try:
+            self.last_leak_check = run_leak_check()
+        finally:
+            QApplication.restoreOverrideCursor()
+        self.refresh()
+        QMessageBox.information(self, "Manual Leak Check", format_leak_check(self.last_leak_check))
+
+    def render_benchmark(self) -> None:
+        if self.render_benchmark_runner is not None:
+            return
+        self.render_benchmark_button.setEnabled(False)
+        self.render_benchmark_button.setText("Benchmarking…")
+        self.render_benchmark_runner = RenderBenchmark(self.on_render_benchmark_done, parent=self)
+        self.render_benchmark_runner.start()
+
+    def on_render_benchmark_done(self, result: dict) -> None:
+        self.render_benchmark_runner = None
+        self.render_benchmark_button.setEnabled(True)
+        self.render_benchmark_button.setText("Render Benchmark")
+        self.last_render_benchmark = result
+        baseline = save_benchmark(result)["baseline"]
+        message = QMessageBox(QMessageBox.Icon.Information, "Render Benchmark", format_benchmark(result, baseline), parent=self)
+        message.addButton(QMessageBox.StandardButton.Ok)
+        set_baseline = message.addButton("Use as Baseline", QMessageBox.ButtonRole.ActionRole)
+        if baseline is result:
+            set_baseline.setEnabled(False)
+        message.exec()
+        if message.clickedButton() is set_baseline:
+            set_benchmark_baseline(result)
+            tooltip("Saved as the new baseline", parent=self)
+
+    def done(self, result: int) -> None:
+        if self.render_benchmark_runner is not None:
+            self.render_benchmark_runner.cancel()
+        super().done(result)
+
+    # === Buttons ===
+    def make_button_box(self) -> QLayout:
+        def button(label: str, callback) -> QPushButton:
+            push_button = QPushButton(label)
+            push_button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+            qconnect(push_button.clicked, callback)
+            return push_button
+
+        button_box = QHBoxLayout()
+        button_box.addWidget(button("Reset", self.reset))
+        button_box.addWidget(button("Export JSON…", self.export))
+        leak_check_button = button("Manual Leak Check", self.leak_check)
+        leak_check_button.setToolTip(
+            "Manual diagnostic: cycles the config dialog, theme editor, theme swaps and dialog styling "
+            "in a sandbox and reports retained Qt objects and memory. Takes a few seconds."
+        )
+        button_box.addWidget(leak_check_button)
+        self.render_benchmark_button = button("Render Benchmark", self.render_benchmark)
+        button_box.addWidget(self.render_benchmark_button)
+        button_box.addStretch()
+        button_box.addWidget(button("Close", self.accept))
+        return button_box
@@ -0,0 +1,92 @@
+from typing import Callable, List
+
+from aqt import mw
+from aqt.qt import QApplication, QEvent, QObject, QTimer, qconnect
+
+from .logger import logger
+from .perf import perf
+
+# === Scheduler Constants ===
+# How long the user has to stay idle before prewarming resumes after input.
+IDLE_RESUME_MS = 1500
+START_DELAY_MS = 2000
+
+INPUT_EVENTS = (
+    QEvent.Type.KeyPress,
+    QEvent.Type.MouseButtonPress,
+    QEvent.Type.MouseButtonDblClick,
+    QEvent.Type.Wheel,
+)
+
+
+# === Prewarm Scheduler ===
+class PrewarmScheduler(QObject):
+    """Warms caches at low priority after startup.
+
+    File and parse work runs on a background thread. Qt work then runs one task per
+    zero-interval timer tick, and pauses whenever the user presses a key, clicks or scrolls.
+    A GUI task that is a generator function runs one ``yield`` step per tick.
+    """
+
+    def __init__(self, background_tasks: List[Callable], gui_tasks: List[Callable], parent=None):
+        super().__init__(parent or mw)
+        self.background_tasks = list(background_tasks)
+        self.gui_tasks = list(gui_tasks)
+        self.active_steps = None
+        self.slice_timer = QTimer(self)
+        self.slice_timer.setInterval(0)
+        qconnect(self.slice_timer.timeout, self.run_slice)
+        self.resume_timer = QTimer(self)
+        self.resume_timer.setSingleShot(True)
+        qconnect(self.resume_timer.timeout, self.slice_timer.start)
+
+    def start(self) -> None:
+        mw.taskman.run_in_background(self.run_background_tasks, self.on_background_done)
+
+    def run_background_tasks(self) -> None:
+        for task in self.background_tasks:
+            with perf.measure(f"prewarm/{task.__name__}"):
+                task()
+
+    def on_background_done(self, future) -> None:
+        try:
+            future.result()
+        except Exception as error:
+            logger.debug(f"Prewarm background work failed: {error}")
+        QApplication.instance().installEventFilter(self)
+        self.slice_timer.start()
+
+    def run_slice(self) -> None:
+        if self.active_steps is None:
+            if not self.gui_tasks:
+                self.finish()
+                return
+            task = self.gui_tasks.pop(0)
+            name = task.__name__
+        else:
+            task, name = self.active_steps
+        try:
+            with perf.measure(f"prewarm/{name}"):
+                if self.active_steps is None:
+                    result = task()
+                    if hasattr(result, "__next__"):
+                        self.active_steps = (result.__next__, name)
+                else:
+                    task()
+        except StopIteration:
+            self.active_steps = None
+        except Exception as error:
+            self.active_steps = None
+            logger.debug(f"Prewarm task {name} failed: {error}")
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if event.type() in INPUT_EVENTS and (self.gui_tasks or self.active_steps):
+            self.slice_timer.stop()
+            self.resume_timer.start(IDLE_RESUME_MS)
+        return False
+
+    def finish(self) -> None:
+        self.slice_timer.stop()
+        self.resume_timer.stop()
+        QApplication.instance().removeEventFilter(self)
+        logger.debug("Prewarm finished")
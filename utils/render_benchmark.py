@@ -0,0 +1,310 @@
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Callable
+
+from aqt import mw
+from aqt.qt import *
+from aqt.theme import theme_manager
+
+from .capabilities import capabilities
+from .css_files import files_dir
+from .custom_css import build_custom_css
+from .logger import logger
+
+# === Benchmark Settings ===
+ROW_COUNTS = (100, 1000, 10000)
+REPEATS = 3
+VIEWPORT_SIZE = (800, 600)
+# Synthetic decks nest this deep, so rows carry the same indentation Anki renders.
+MAX_DECK_DEPTH = 4
+POLL_INTERVAL_MS = 50
+PAGE_TIMEOUT_MS = 30000
+# How long a page waits for its first contentful paint before measuring without it.
+PAINT_WAIT_MS = 2000
+HISTORY_LIMIT = 20
+
+this_script_dir = os.path.join(os.path.dirname(__file__), "..")
+benchmark_path = os.path.join(this_script_dir, "user_files", "render_benchmark.json")
+
+METRIC_LABELS = (
+    ("style_recalc_ms", "style"),
+    ("layout_ms", "layout"),
+    ("first_paint_ms", "first paint"),
+    ("load_ms", "load"),
+)
+METRICS = ("style_recalc_ms", "layout_ms", "first_paint_ms", "first_contentful_paint_ms", "load_ms")
+
+
+# === Stylesheet Variants ===
+# Variant -> function returning (stylesheet files, inline CSS) for the deck browser page.
+def bare_stylesheets() -> tuple:
+    return [], ""
+
+
+def addon_stylesheets(performance_mode: bool = False) -> tuple:
+    files = [os.path.join(files_dir, "global.css"), os.path.join(files_dir, "DeckBrowser.css")]
+    if performance_mode:
+        files.append(os.path.join(files_dir, "performance.css"))
+    return files, build_custom_css(performance_mode=performance_mode)
+
+
+STYLESHEET_VARIANTS = {
+    "bare": bare_stylesheets,
+    "addon": addon_stylesheets,
+    "performance": lambda: addon_stylesheets(performance_mode=True),
+}
+
+
+# === Synthetic Deck Browser ===
+# Measures a night mode toggle (style recalculation on every row) and a one pixel
+# width change (full relayout), once the page has painted.
+MEASURE_JS = """
+window.benchmarkResult = null;
+(function() {
+    const deadline = performance.now() + %d;
+    function paintTimes() {
+        const times = {};
+        for (const entry of performance.getEntriesByType("paint")) {
+            times[entry.name] = entry.startTime;
+        }
+        return times;
+    }
+    function measure() {
+        const paints = paintTimes();
+        if (!("first-contentful-paint" in paints) && performance.now() < deadline) {
+            requestAnimationFrame(measure);
+            return;
+        }
+        const rows = document.querySelectorAll("tr.deck");
+        const lastRow = rows[rows.length - 1];
+        let start = performance.now();
+        document.body.classList.toggle("nightMode");
+        getComputedStyle(lastRow).backgroundColor;
+        const styleRecalc = performance.now() - start;
+        document.body.classList.toggle("nightMode");
+        document.body.offsetHeight;
+        start = performance.now();
+        document.body.style.paddingRight = "1px";
+        document.body.offsetHeight;
+        const layout = performance.now() - start;
+        document.body.style.paddingRight = "";
+        window.benchmarkResult = {
+            rows: rows.length,
+            style_recalc_ms: styleRecalc,
+            layout_ms: layout,
+            first_paint_ms: "first-paint" in paints ? paints["first-paint"] : null,
+            first_contentful_paint_ms: "first-contentful-paint" in paints ? paints["first-contentful-paint"] : null,
+        };
+    }
+    window.addEventListener("load", () => requestAnimationFrame(measure));
+})();
+"""
+
+
+def build_deck_rows(row_count: int) -> str:
+    # Same markup as Anki's deck browser rows; the first deck is the current one.
+    rows = []
+    for idx in range(row_count):
+        depth = idx % MAX_DECK_DEPTH
+        classes = "deck current" if idx == 0 else "deck"
+        collapse = "<a class=collapse href=#>-</a>" if depth < MAX_DECK_DEPTH - 1 else "<span class=collapse></span>"
+        rows.append(
+            f"<tr class='{classes}' id='{idx + 1}'>"
+            f"<td class=decktd colspan=5>{'&nbsp;' * 6 * depth}{collapse}"
+            f"<a class=deck href=#>Deck {idx + 1}</a></td>"
+            f"<td align=end><a class=review-count>{idx % 97}</a></td>"
+            f"<td align=end><a class=new-count>{idx % 20}</a></td>"
+            f"<td align=center class=opts><a><img class=gears></a></td></tr>"
+        )
+    return "\n".join(rows)
+
+
+def build_deck_browser_html(row_count: int, stylesheets: list, custom_css: str, night_mode: bool) -> str:
+    links = "\n".join(f'<link rel="stylesheet" href="{QUrl.fromLocalFile(path).toString()}">' for path in stylesheets)
+    body_class = "isLin nightMode night_mode" if night_mode else "isLin"
+    return f"""<!doctype html>
+<html>
+<head>
+<meta charset="utf-8">
+{links}
+<style>{custom_css}</style>
+<script>{MEASURE_JS % PAINT_WAIT_MS}</script>
+</head>
+<body class="{body_class}">
+<center>
+<table cellspacing=0 cellpadding=3>
+<tr><th colspan=5 align=start>Deck</th><th class=count>Due</th><th class=count>New</th><th class=optscol></th></tr>
+{build_deck_rows(row_count)}
+</table>
+</center>
+</body>
+</html>
+"""
+
+
+# === Benchmark Runner ===
+class RenderBenchmark(QObject):
+    """Loads synthetic deck browser pages into a hidden QtWebEngine view, one at a time.
+
+    Every row count runs with every stylesheet variant ``REPEATS`` times; the result
+    holds the median of each metric.
+    """
+
+    def __init__(self, on_done: Callable[[dict], None], parent=None):
+        super().__init__(parent or mw)
+        self.on_done = on_done
+        self.runs = [(rows, variant) for rows in ROW_COUNTS for variant in STYLESHEET_VARIANTS for _ in range(REPEATS)]
+        self.samples = {}
+        self.pages = {}
+        self.work_dir = None
+        self.view = None
+        self.load_started = 0.0
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(POLL_INTERVAL_MS)
+        qconnect(self.poll_timer.timeout, self.poll)
+        self.timeout_timer = QTimer(self)
+        self.timeout_timer.setSingleShot(True)
+        qconnect(self.timeout_timer.timeout, self.on_timeout)
+
+    def start(self) -> None:
+        self.work_dir = tempfile.mkdtemp(prefix="anki-redesign-benchmark-")
+        night_mode = theme_manager.get_night_mode()
+        for variant, get_stylesheets in STYLESHEET_VARIANTS.items():
+            stylesheets, custom_css = get_stylesheets()
+            for rows in ROW_COUNTS:
+                path = os.path.join(self.work_dir, f"deck-browser-{rows}-{variant}.html")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(build_deck_browser_html(rows, stylesheets, custom_css, night_mode))
+                self.pages[(rows, variant)] = path
+        self.view = QWebEngineView()
+        self.view.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, True)
+        self.view.resize(*VIEWPORT_SIZE)
+        qconnect(self.view.loadFinished, self.on_load_finished)
+        self.view.show()
+        self.load_next()
+
+    def load_next(self) -> None:
+        if not self.runs:
+            self.finish()
+            return
+        self.load_started = time.perf_counter()
+        self.timeout_timer.start(PAGE_TIMEOUT_MS)
+        self.view.load(QUrl.fromLocalFile(self.pages[self.runs[0]]))
+
+    def on_load_finished(self, ok: bool) -> None:
+        if not ok:
+            logger.debug(f"Benchmark page failed to load: {self.runs[0]}")
+            self.skip_run()
+            return
+        self.poll_timer.start()
+
+    def poll(self) -> None:
+        self.view.page().runJavaScript("window.benchmarkResult || null", self.on_poll_result)
+
+    def on_poll_result(self, measured) -> None:
+        if not measured or not self.poll_timer.isActive():
+            return
+        self.poll_timer.stop()
+        self.timeout_timer.stop()
+        measured["load_ms"] = (time.perf_counter() - self.load_started) * 1000
+        self.samples.setdefault(self.runs.pop(0), []).append(measured)
+        self.load_next()
+
+    def on_timeout(self) -> None:
+        logger.debug(f"Benchmark page timed out: {self.runs[0]}")
+        self.skip_run()
+
+    def skip_run(self) -> None:
+        self.poll_timer.stop()
+        self.timeout_timer.stop()
+        self.runs.pop(0)
+        self.load_next()
+
+    def cancel(self) -> None:
+        self.runs = []
+        self.poll_timer.stop()
+        self.timeout_timer.stop()
+        self.cleanup()
+
+    def cleanup(self) -> None:
+        if self.view is not None:
+            self.view.deleteLater()
+            self.view = None
+        if self.work_dir:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+            self.work_dir = None
+
+    def finish(self) -> None:
+        self.cleanup()
+        results = []
+        for (rows, variant), samples in self.samples.items():
+            entry = {"rows": rows, "stylesheet": variant, "samples": len(samples)}
+            for metric in METRICS:
+                values = [sample[metric] for sample in samples if sample.get(metric) is not None]
+                entry[metric] = round(statistics.median(values), 2) if values else None
+            results.append(entry)
+        self.on_done({
+            "created_at": time.time(),
+            "anki_version": capabilities.anki_version,
+            "qt6": capabilities.qt6,
+            "night_mode": theme_manager.get_night_mode(),
+            "viewport": list(VIEWPORT_SIZE),
+            "repeats": REPEATS,
+            "results": results,
+        })
+
+
+# === Baseline Storage ===
+def read_benchmarks() -> dict:
+    try:
+        with open(benchmark_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"baseline": None, "history": []}
+
+
+def _write_benchmarks(data: dict) -> None:
+    os.makedirs(os.path.dirname(benchmark_path), exist_ok=True)
+    with open(benchmark_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def save_benchmark(result: dict) -> dict:
+    """Append ``result`` to the saved history; the first result saved becomes the baseline."""
+    data = read_benchmarks()
+    data["history"] = (data.get("history", []) + [result])[-HISTORY_LIMIT:]
+    if not data.get("baseline"):
+        data["baseline"] = result
+    _write_benchmarks(data)
+    return data
+
+
+def set_benchmark_baseline(result: dict) -> None:
+    data = read_benchmarks()
+    data["baseline"] = result
+    _write_benchmarks(data)
+
+
+def format_benchmark(result: dict, baseline: dict = None) -> str:
+    """One line per row count and stylesheet, with the change against ``baseline``."""
+    previous = {}
+    if baseline and baseline is not result:
+        previous = {(entry["rows"], entry["stylesheet"]): entry for entry in baseline.get("results", [])}
+    lines = []
+    for entry in sorted(result["results"], key=lambda entry: (entry["rows"], entry["stylesheet"])):
+        parts = []
+        for metric, label in METRIC_LABELS:
+            value = entry.get(metric)
+            if value is None:
+                continue
+            text = f"{label} {value:.1f} ms"
+            before = previous.get((entry["rows"], entry["stylesheet"]), {}).get(metric)
+            if before:
+                text += f" ({(value - before) / before:+.0%})"
+            parts.append(text)
+        lines.append(f"{entry['rows']:,} rows, {entry['stylesheet']}: {', '.join(parts) or 'no data'}")
+    return "\n".join(lines)
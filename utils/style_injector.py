@@ -0,0 +1,38 @@
+import json
+from typing import Callable
+
+from aqt.qt import qconnect
+
+# === Stylesheet Injection ===
+# For webviews the add-on can't reach through webview_will_set_content (e.g. the
+# NewDeckStats page). The style element is keyed by id, so repeated injections
+# replace its contents instead of stacking new elements.
+STYLE_ELEMENT_ID = "anki-redesign-style"
+INJECTOR_PROPERTY = "ankiRedesignStyleInjector"
+
+INJECT_STYLE_JS = """
+(function(id, css) {
+    let style = document.getElementById(id);
+    if (!style) {
+        style = document.createElement("style");
+        style.id = id;
+        (document.head || document.documentElement).appendChild(style);
+    }
+    if (style.textContent !== css) {
+        style.textContent = css;
+    }
+})(%s, %s);
+"""
+
+
+def inject_stylesheet(web, css: str, element_id: str = STYLE_ELEMENT_ID) -> None:
+    web.eval(INJECT_STYLE_JS % (json.dumps(element_id), json.dumps(css)))
+
+
+def attach_stylesheet(web, css_provider: Callable[[], str], element_id: str = STYLE_ELEMENT_ID) -> None:
+    """Inject now and again after every page load of ``web``; safe to call on each open."""
+    inject_stylesheet(web, css_provider(), element_id)
+    if web.property(INJECTOR_PROPERTY):
+        return
+    web.setProperty(INJECTOR_PROPERTY, True)
+    qconnect(web.loadFinished, lambda _ok: inject_stylesheet(web, css_provider(), element_id))
@@ -0,0 +1,52 @@
+import weakref
+from contextlib import contextmanager
+from typing import Callable
+
+from .logger import logger
+from .perf import perf
+
+# === Styled Object Registry ===
+# Every window and webview the add-on has styled, mapped to the function that restyles it.
+# Keys are weak, so closed windows drop out on their own. A restyler receives the object
+# as its argument and must not close over it, or the object would never be released.
+_styled = weakref.WeakKeyDictionary()
+perf.add_gauge("styled_objects", lambda: len(_styled))
+# Set while restyle_registered() should leave every object as it is.
+_suspended = False
+
+
+def register_styled(obj, restyle: Callable) -> None:
+    _styled[obj] = restyle
+
+
+def count_styled() -> int:
+    return len(_styled)
+
+
+def restyle_registered(exclude: list = ()) -> int:
+    """Re-apply the current theme to every live registered object; returns how many were restyled."""
+    if _suspended:
+        return 0
+    restyled = 0
+    for obj, restyle in list(_styled.items()):
+        if any(obj is excluded for excluded in exclude):
+            continue
+        try:
+            restyle(obj)
+        except RuntimeError as error:
+            # The Qt object is gone but its Python wrapper is still around.
+            logger.debug(f"Dropping deleted styled object: {error}")
+            _styled.pop(obj, None)
+            continue
+        restyled += 1
+    return restyled
+
+
+@contextmanager
+def restyling_suspended():
+    global _suspended
+    _suspended = True
+    try:
+        yield
+    finally:
+        _suspended = False
@@ -0,0 +1,393 @@
+from types import SimpleNamespace
+
+# === Anki/Qt Imports ===
+from aqt import gui_hooks, mw
+from aqt.qt import *
+from aqt.theme import theme_manager
+from anki.hooks import wrap
+
+# === Local Imports ===
+from ..config import get_config
+from . import colors_sync, deck_themes, palette, themes
+from ..injections.toolbar import install_toolbar_sizer, redraw_toolbar_legacy
+from .capabilities import capabilities
+from .color_validation import parse_color
+from .colors_sync import restore_colors, sync_colors
+from .css_files import addon_package, preload_qss
+from .deck_themes import get_deck_theme_index, get_deck_theme_name
+from .hooks import theme_did_apply
+from .leak_check import register_leak_check_cache, register_leak_check_step
+from .logger import logger
+from .modules import *
+from .palette import build_palette, get_palette, get_window_bg_color, set_window_bg_color
+from .perf import perf
+from .prewarm import START_DELAY_MS, PrewarmScheduler
+from .styled_registry import restyle_registered
+from .theme_manifest import SWATCH_MODES, get_theme_manifest
+from .themes import get_theme, get_theme_color_report, get_theme_hash, list_theme_names, normalize_theme_name
+from .translation import get_texts_dict
+
+# === Theme State ===
+LIGHT_COLOR_MODE = 2
+DARK_COLOR_MODE = 3
+
+
+def get_effective_color_mode() -> int:
+    return DARK_COLOR_MODE if theme_manager.get_night_mode() else LIGHT_COLOR_MODE
+
+
+def get_active_theme_name(config_data: dict) -> str:
+    return normalize_theme_name(config_data.get("theme_name", "Anki"))
+
+
+initial_config = get_config()
+themes_parsed = get_theme(get_active_theme_name(initial_config))
+color_mode = get_effective_color_mode()
+
+# === UI Refresh ===
+def get_main_webviews() -> list:
+    webviews = [
+        getattr(mw, "web", None),
+        getattr(getattr(mw, "toolbar", None), "web", None),
+        getattr(mw, "bottomWeb", None),
+    ]
+    return [web for web in webviews if web is not None]
+
+
+@perf.timed("refresh_all_windows")
+def refresh_all_windows() -> None:
+    # Redraw top toolbar
+    install_toolbar_sizer()
+    mw.toolbar.draw()
+    if capabilities.has_top_toolbar_did_init_links:
+        append_hook_once(gui_hooks.top_toolbar_did_init_links, redraw_toolbar_legacy)
+
+    # Redraw main body
+    if mw.state == "review":
+        mw.reviewer._initWeb()
+        # Legacy check
+        if getattr(mw.reviewer, "_redraw_current_card", False):
+            mw.reviewer._redraw_current_card()
+            mw.fade_in_webview()
+    elif mw.state == "overview":
+        mw.overview.refresh()
+    elif mw.state == "deckBrowser":
+        mw.deckBrowser.show()
+
+
+# === Theme Application ===
+def get_mode_colors(theme: dict, mode: int) -> dict:
+    parsed_colors = get_theme_color_report(theme)["colors"]
+    mode_colors = {}
+    for color_name, c in theme.get("colors").items():
+        mode_colors[color_name] = parsed_colors.get(color_name, {}).get(mode, c[mode])
+    return mode_colors
+
+
+def get_effective_theme_name(config_data: dict, state: str) -> str:
+    return get_deck_theme_name(config_data["deck_themes"], state) or get_active_theme_name(config_data)
+
+
+@perf.timed("update_theme")
+def update_theme() -> None:
+    global themes_parsed, color_mode, applied_theme_name
+    config_data = get_config()
+    theme_name = get_effective_theme_name(config_data, getattr(mw, "state", ""))
+    applied_theme_name = theme_name
+    themes_parsed = get_theme(theme_name)
+    theme_colors = themes_parsed.get("colors")
+    color_mode = get_effective_color_mode()
+    # Apply theme on colors
+    ncolors = get_mode_colors(themes_parsed, color_mode)
+    theme_hash = get_theme_hash(themes_parsed)
+    logger.debug(sync_colors(theme_hash, theme_colors))
+    apply_theme(ncolors, theme_hash)
+    theme_did_apply(themes_parsed, color_mode)
+    with perf.measure("restyle_registered"):
+        # The main webviews are redrawn below; everything else is restyled in place.
+        restyle_registered(exclude=get_main_webviews())
+    refresh_all_windows()
+
+
+# === Per-Deck Themes ===
+# Name of the theme currently applied to the UI, global or per-deck.
+applied_theme_name = None
+
+
+def swap_theme(theme_name: str) -> None:
+    """Swap in another theme's cached palette and CSS variables without redrawing anything."""
+    global themes_parsed, applied_theme_name
+    if theme_name == applied_theme_name:
+        return
+    applied_theme_name = theme_name
+    themes_parsed = get_theme(theme_name)
+    theme_hash = get_theme_hash(themes_parsed)
+    sync_colors(theme_hash, themes_parsed.get("colors"))
+    # Same mode, so the Qt style stays valid; only the palette and variables change.
+    apply_palette(get_mode_colors(themes_parsed, color_mode), theme_hash)
+    theme_did_apply(themes_parsed, color_mode)
+    restyle_registered()
+
+
+def on_state_will_change(new_state: str, old_state: str) -> None:
+    config_data = get_config()
+    if not config_data["deck_themes"] and applied_theme_name == get_active_theme_name(config_data):
+        return
+    # Runs before the new state renders, so its webviews are built with the right variables.
+    with perf.measure("swap_deck_theme"):
+        swap_theme(get_effective_theme_name(config_data, new_state))
+
+
+if capabilities.has_state_will_change:
+    gui_hooks.state_will_change.append(on_state_will_change)
+
+
+# === Live Preview ===
+def preview_theme_colors(theme: dict) -> None:
+    """Push unsaved colors to the running UI: palette plus webview variables only.
+
+    Skips the style reset and legacy color sync of update_theme, and leaves the
+    per-theme palette cache alone so that intermediate colors are not retained.
+    """
+    colors = {name: parse_color(c[color_mode]) or c[color_mode] for name, c in theme["colors"].items()}
+    apply_palette(colors)
+    theme_did_apply(theme, color_mode)
+    restyle_registered()
+
+
+def reapply_saved_theme() -> None:
+    global themes_parsed, color_mode, applied_theme_name
+    # Same theme choice as update_theme, so a deck's own theme survives a cancelled preview.
+    theme_name = get_effective_theme_name(get_config(), getattr(mw, "state", ""))
+    applied_theme_name = theme_name
+    themes_parsed = get_theme(theme_name)
+    color_mode = get_effective_color_mode()
+    theme_hash = get_theme_hash(themes_parsed)
+    apply_theme(get_mode_colors(themes_parsed, color_mode), theme_hash)
+    theme_did_apply(themes_parsed, color_mode)
+    restyle_registered()
+
+
+# === Palette Application ===
+@perf.timed("apply_palette")
+def apply_palette(colors, theme_hash: str = "") -> None:
+    """Swap the app palette and webview background without resetting the Qt style.
+
+    Without ``theme_hash`` the palette is built fresh and not cached.
+    """
+    if theme_hash:
+        palette, window_bg = get_palette(theme_hash, color_mode, colors)
+    else:
+        palette, window_bg = build_palette(colors)
+    set_window_bg_color(window_bg)
+    mw.app.setPalette(palette)
+
+
+@perf.timed("apply_theme")
+def apply_theme(colors, theme_hash: str = "") -> None:
+    logger.debug(colors)
+    if getattr(theme_manager, "_default_style", False):
+        mw.app.setStyle(QStyleFactory.create(theme_manager._default_style))
+        if getattr(theme_manager, "default_palette", False):
+            mw.app.setPalette(theme_manager.default_palette)
+        else:
+            theme_manager._apply_palette(mw.app)
+    if theme_hash:
+        palette, window_bg = get_palette(theme_hash, color_mode, colors)
+    else:
+        palette, window_bg = build_palette(colors)
+
+    # Update webview background
+    set_window_bg_color(window_bg)
+
+    theme_manager._apply_palette(mw.app)  # Update palette theme_manager
+    mw.app.setPalette(palette)  # Overwrite palette
+    theme_manager._apply_style(mw.app)  # Update stylesheet theme_manager
+
+
+# === Menu Wiring ===
+# The config dialog and theme editor module, imported on first use.
+config_ui = None
+
+
+def load_config_ui():
+    global config_ui
+    if config_ui is None:
+        with perf.measure("import/config_ui"):
+            from . import dialog
+        config_ui = dialog
+    return config_ui
+
+
+def open_config_dialog() -> None:
+    load_config_ui().open_config_dialog()
+
+
+def open_diagnostics_dialog() -> None:
+    from .perf_dialog import AnkiRedesignPerformanceDialog
+    AnkiRedesignPerformanceDialog(mw).exec()
+
+
+def add_hidden_diagnostics_action(menu: QMenu) -> None:
+    # Only listed while Shift is held as the Tools menu opens.
+    action = QAction("Anki Redesign+ Diagnostics", mw)
+    qconnect(action.triggered, open_diagnostics_dialog)
+    action.setVisible(False)
+    menu.addAction(action)
+    qconnect(
+        menu.aboutToShow,
+        lambda: action.setVisible(
+            bool(QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier)
+        ),
+    )
+
+
+# === Menu Registration ===
+def apply_startup_theme() -> None:
+    mw.reset()
+    update_theme()
+    if capabilities.qt6:
+        logger.debug('QT6 detected...')
+        mw.reset()
+        update_theme()
+
+
+if not hasattr(mw, 'anki_redesign'):
+    config_action = QAction("Anki Redesign+", mw)
+    qconnect(config_action.triggered, open_config_dialog)
+    mw.form.menuTools.addAction(config_action)
+    add_hidden_diagnostics_action(mw.form.menuTools)
+    mw.anki_redesign = SimpleNamespace(theme_did_apply=theme_did_apply)
+    # Once the main window is up, so the add-on import budget covers import work alone.
+    if capabilities.has_main_window_did_init:
+        append_hook_once(gui_hooks.main_window_did_init, apply_startup_theme)
+    else:
+        apply_startup_theme()
+
+
+# === Color Mode Switching ===
+NIGHT_MODE_CLASSES_JS = """
+(function(night) {
+    document.documentElement.classList.toggle("night-mode", night);
+    if (document.body) {
+        document.body.classList.toggle("nightMode", night);
+        document.body.classList.toggle("night_mode", night);
+    }
+})(%s);
+"""
+
+
+def switch_color_mode() -> None:
+    # Webviews already carry both light and dark variables keyed on body.nightMode,
+    # so a mode switch only swaps the cached palette and flips the mode classes.
+    apply_theme(get_mode_colors(themes_parsed, color_mode), get_theme_hash(themes_parsed))
+    theme_did_apply(themes_parsed, color_mode)
+    night_mode = "true" if color_mode == DARK_COLOR_MODE else "false"
+    for web in get_main_webviews():
+        web.page().setBackgroundColor(get_window_bg_color())
+        web.eval(NIGHT_MODE_CLASSES_JS % night_mode)
+
+
+# === Theme Change Hook ===
+def on_theme_did_change() -> None:
+    global color_mode
+    color_mode = get_effective_color_mode()
+    logger.debug("Theme changed")
+    switch_color_mode()
+
+
+if capabilities.has_theme_did_change:
+    gui_hooks.theme_did_change.append(on_theme_did_change)
+
+
+# === Add-on Disable Hook ===
+def on_addon_toggled(addon_dir: str, *_, **__) -> None:
+    # aqt passes enable= by keyword when it disables conflicting add-ons on install.
+    if addon_dir == addon_package and not mw.addonManager.isEnabled(addon_dir):
+        logger.debug(restore_colors())
+
+
+mw.addonManager.toggleEnabled = wrap(mw.addonManager.toggleEnabled, on_addon_toggled, "after")
+
+
+# === Leak Check Steps ===
+def leak_check_theme_swap() -> None:
+    current = applied_theme_name
+    other = next((name for name in list_theme_names() if name != current), current)
+    swap_theme(other)
+    swap_theme(current)
+
+
+register_leak_check_step("config_dialog", lambda: load_config_ui().leak_check_config_dialog())
+register_leak_check_step("theme_editor", lambda: load_config_ui().leak_check_theme_editor())
+register_leak_check_step("theme_swap", leak_check_theme_swap)
+
+
+def get_thumbnail_cache() -> dict:
+    from .theme_gallery import _thumbnail_cache
+    return _thumbnail_cache
+
+
+register_leak_check_cache("color_reports", lambda: themes._color_reports)
+register_leak_check_cache("raw_themes", lambda: themes._raw_theme_cache)
+register_leak_check_cache("resolved_themes", lambda: themes._resolved_theme_cache)
+register_leak_check_cache("chain_hashes", lambda: themes._chain_hash_cache)
+register_leak_check_cache("palettes", lambda: palette._palette_cache)
+register_leak_check_cache("color_sync_targets", lambda: colors_sync._target_cache)
+register_leak_check_cache("deck_theme_index", lambda: deck_themes._index_cache)
+register_leak_check_cache("thumbnails", get_thumbnail_cache)
+
+
+# === Cache Prewarming ===
+def prewarm_active_theme() -> None:
+    get_theme_color_report(get_theme(get_active_theme_name(initial_config)))
+
+
+def prewarm_font_families() -> None:
+    from .font_picker import list_font_families
+    list_font_families()
+
+
+def prewarm_deck_themes():
+    # Validate, parse and build palettes for every mapped theme, one theme per slice.
+    mode = get_effective_color_mode()
+    for theme_name in get_deck_theme_index(get_config()["deck_themes"]).theme_names():
+        theme = get_theme(theme_name)
+        get_palette(get_theme_hash(theme), mode, get_mode_colors(theme, mode))
+        yield
+
+
+def prewarm_theme_thumbnails():
+    from .theme_gallery import render_theme_thumbnail
+    mode = SWATCH_MODES[get_effective_color_mode()]
+    for entry in list(get_theme_manifest().values()):
+        render_theme_thumbnail(entry.get("swatches", {}).get(mode, {}))
+        yield
+
+
+def prebuild_config_dialog():
+    # One color row or settings section per slice, so input can interrupt the build.
+    yield from load_config_ui().build_config_dialog_steps()
+
+
+def start_prewarm() -> None:
+    if not get_config()["prewarm_enabled"] or getattr(mw.anki_redesign, "prewarm", None):
+        return
+    background_tasks = [get_texts_dict, get_theme_manifest, preload_qss, prewarm_active_theme]
+    if capabilities.qt6:
+        background_tasks.append(prewarm_font_families)
+    mw.anki_redesign.prewarm = PrewarmScheduler(
+        background_tasks=background_tasks,
+        gui_tasks=[prewarm_deck_themes, prewarm_theme_thumbnails, prebuild_config_dialog],
+    )
+    mw.anki_redesign.prewarm.start()
+
+
+def schedule_prewarm() -> None:
+    QTimer.singleShot(START_DELAY_MS, start_prewarm)
+
+
+if capabilities.has_main_window_did_init:
+    append_hook_once(gui_hooks.main_window_did_init, schedule_prewarm)
+else:
+    schedule_prewarm()
@@ -0,0 +1,264 @@
+from typing import Callable
+
+from aqt.qt import *
+
+from .color_validation import parse_color
+from .perf import perf
+from .theme_manifest import PREVIEW_SWATCHES
+
+# === Gallery Constants ===
+THUMBNAIL_WIDTH = 92
+THUMBNAIL_HEIGHT = 56
+ITEM_HEIGHT = 68
+MIN_ITEM_WIDTH = 220
+VISIBLE_ROWS = 4
+
+ThemeNameRole = Qt.ItemDataRole.UserRole + 1
+TaglineRole = Qt.ItemDataRole.UserRole + 2
+ThumbnailRole = Qt.ItemDataRole.UserRole + 3
+
+
+# === Thumbnails ===
+# Rendered thumbnails keyed by their swatch colors, shared across dialog instances.
+THUMBNAIL_CACHE_LIMIT = 256
+_thumbnail_cache = {}
+perf.add_gauge("cache_size/thumbnail", lambda: len(_thumbnail_cache))
+
+
+def render_theme_thumbnail(mode_swatches: dict) -> QPixmap:
+    cache_key = tuple(sorted(mode_swatches.items()))
+    pixmap = _thumbnail_cache.get(cache_key)
+    if pixmap is not None:
+        return pixmap
+
+    swatches = {}
+    for swatch, (_, fallback) in PREVIEW_SWATCHES.items():
+        # Swatches are CSS hex (#rrggbbaa), which QColor would read as #aarrggbb.
+        swatches[swatch] = QColor(*parse_color(mode_swatches.get(swatch, fallback)))
+    canvas = swatches["canvas"]
+    surface = swatches["surface"]
+    border = swatches["border"]
+    fg = swatches["fg"]
+    subtle_fg = swatches["subtle_fg"]
+    primary = swatches["primary"]
+    highlight = swatches["highlight"]
+
+    pixmap = QPixmap(THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+
+    painter.setPen(QPen(border, 1))
+    painter.setBrush(canvas)
+    painter.drawRoundedRect(QRectF(1, 1, 90, 54), 8, 8)
+
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(surface)
+    painter.drawRoundedRect(QRectF(6, 6, 80, 44), 6, 6)
+
+    painter.setBrush(highlight)
+    painter.drawRoundedRect(QRectF(11, 12, 40, 6), 3, 3)
+    painter.drawRoundedRect(QRectF(11, 22, 26, 5), 2.5, 2.5)
+
+    painter.setBrush(primary)
+    painter.drawRoundedRect(QRectF(58, 12, 22, 10), 4, 4)
+    painter.drawRoundedRect(QRectF(58, 27, 22, 17), 4, 4)
+
+    painter.setPen(QPen(fg, 1.2))
+    painter.drawLine(QPointF(11, 35), QPointF(44, 35))
+    painter.setPen(QPen(subtle_fg, 1.2))
+    painter.drawLine(QPointF(11, 41), QPointF(39, 41))
+    painter.end()
+
+    if len(_thumbnail_cache) >= THUMBNAIL_CACHE_LIMIT:
+        _thumbnail_cache.clear()
+    _thumbnail_cache[cache_key] = pixmap
+    return pixmap
+
+
+# === Gallery Model ===
+class ThemeGalleryModel(QAbstractListModel):
+    """Theme names plus lazily rendered thumbnails; only painted rows ever fetch one."""
+
+    def __init__(self, theme_names: list, tagline_provider: Callable[[str], str],
+                 thumbnail_provider: Callable[[str], QPixmap], parent=None):
+        super().__init__(parent)
+        self.theme_names = list(theme_names)
+        self.tagline_provider = tagline_provider
+        self.thumbnail_provider = thumbnail_provider
+        self.thumbnails = {}
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.theme_names)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        theme_name = self.theme_names[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, ThemeNameRole):
+            return theme_name
+        if role in (TaglineRole, Qt.ItemDataRole.ToolTipRole):
+            return self.tagline_provider(theme_name)
+        if role == ThumbnailRole:
+            thumbnail = self.thumbnails.get(theme_name)
+            if thumbnail is None:
+                thumbnail = self.thumbnail_provider(theme_name)
+                self.thumbnails[theme_name] = thumbnail
+            return thumbnail
+        return None
+
+    def row_for_theme(self, theme_name: str) -> int:
+        try:
+            return self.theme_names.index(theme_name)
+        except ValueError:
+            return -1
+
+    def set_theme_names(self, theme_names: list) -> None:
+        self.beginResetModel()
+        self.theme_names = list(theme_names)
+        self.thumbnails = {name: pixmap for name, pixmap in self.thumbnails.items() if name in self.theme_names}
+        self.endResetModel()
+
+    def invalidate_thumbnails(self, theme_names: list = None) -> None:
+        if theme_names is None:
+            self.thumbnails = {}
+            if self.theme_names:
+                self.dataChanged.emit(self.index(0), self.index(len(self.theme_names) - 1), [ThumbnailRole])
+            return
+        for theme_name in theme_names:
+            self.thumbnails.pop(theme_name, None)
+            row = self.row_for_theme(theme_name)
+            if row >= 0:
+                self.dataChanged.emit(self.index(row), self.index(row), [ThumbnailRole])
+
+
+# === Gallery Delegate ===
+class ThemeGalleryDelegate(QStyledItemDelegate):
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        rect = QRectF(option.rect).adjusted(3, 3, -3, -3)
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        if selected:
+            background, border = QColor(59, 130, 246, 46), QColor("#3B82F6")
+        elif hovered:
+            background, border = QColor(127, 127, 127, 41), QColor(127, 127, 127, 140)
+        else:
+            background, border = QColor(127, 127, 127, 26), QColor(127, 127, 127, 82)
+        painter.setPen(QPen(border, 1))
+        painter.setBrush(background)
+        painter.drawRoundedRect(rect, 10, 10)
+
+        thumbnail = index.data(ThumbnailRole)
+        thumbnail_top = int(rect.top() + (rect.height() - THUMBNAIL_HEIGHT) / 2)
+        if thumbnail is not None:
+            painter.drawPixmap(int(rect.left()) + 10, thumbnail_top, thumbnail)
+
+        text_left = int(rect.left()) + 10 + THUMBNAIL_WIDTH + 10
+        text_rect = QRect(text_left, int(rect.top()) + 6, int(rect.right()) - text_left - 8, int(rect.height()) - 12)
+        title_font = QFont(option.font)
+        title_font.setPixelSize(14)
+        title_font.setBold(True)
+        painter.setFont(title_font)
+        painter.setPen(option.palette.color(QPalette.ColorRole.Text))
+        title_height = QFontMetrics(title_font).height()
+        title_option = QTextOption(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+        title_option.setWrapMode(QTextOption.WrapMode.NoWrap)
+        painter.drawText(
+            QRectF(text_rect.left(), text_rect.top(), text_rect.width(), title_height),
+            index.data(ThemeNameRole),
+            title_option,
+        )
+        description_font = QFont(option.font)
+        description_font.setPixelSize(13)
+        painter.setFont(description_font)
+        painter.setPen(option.palette.color(QPalette.ColorRole.WindowText))
+        description_option = QTextOption(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+        description_option.setWrapMode(QTextOption.WrapMode.WordWrap)
+        painter.drawText(
+            QRectF(text_rect.left(), text_rect.top() + title_height + 1, text_rect.width(), text_rect.height() - title_height - 1),
+            index.data(TaglineRole) or "",
+            description_option,
+        )
+        painter.restore()
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return QSize(MIN_ITEM_WIDTH, ITEM_HEIGHT)
+
+
+# === Gallery View ===
+class ThemeGalleryView(QListView):
+    """Icon-mode list that lays items out in as many equal columns as fit."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setFlow(QListView.Flow.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setMovement(QListView.Movement.Static)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setMouseTracking(True)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self.setItemDelegate(ThemeGalleryDelegate(self))
+        self.setFixedHeight(ITEM_HEIGHT * VISIBLE_ROWS + 4)
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        width = self.viewport().width()
+        columns = max(1, width // MIN_ITEM_WIDTH)
+        self.setGridSize(QSize(width // columns, ITEM_HEIGHT))
+        super().resizeEvent(event)
+
+
+class ThemeGallery(QWidget):
+    """Filterable, virtualized theme picker; emits theme_selected(name) on user choice."""
+
+    theme_selected = pyqtSignal(str)
+
+    def __init__(self, theme_names: list, tagline_provider: Callable[[str], str],
+                 thumbnail_provider: Callable[[str], QPixmap], filter_placeholder: str = "", parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText(filter_placeholder)
+        self.filter_input.setClearButtonEnabled(True)
+        layout.addWidget(self.filter_input)
+
+        self.model = ThemeGalleryModel(theme_names, tagline_provider, thumbnail_provider, self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.view = ThemeGalleryView()
+        self.view.setModel(self.proxy)
+        layout.addWidget(self.view)
+
+        qconnect(self.filter_input.textChanged, self.proxy.setFilterFixedString)
+        qconnect(self.view.clicked, self.on_clicked)
+
+    def on_clicked(self, index: QModelIndex) -> None:
+        self.theme_selected.emit(index.data(ThemeNameRole))
+
+    def select_theme(self, theme_name: str) -> None:
+        row = self.model.row_for_theme(theme_name)
+        if row < 0:
+            return
+        index = self.proxy.mapFromSource(self.model.index(row))
+        if not index.isValid():
+            self.filter_input.clear()
+            index = self.proxy.mapFromSource(self.model.index(row))
+        self.view.setCurrentIndex(index)
+        self.view.scrollTo(index)
+
+    def set_theme_names(self, theme_names: list) -> None:
+        self.model.set_theme_names(theme_names)
+
+    def invalidate_thumbnails(self, theme_names: list = None) -> None:
+        self.model.invalidate_thumbnails(theme_names)
@@ -0,0 +1,162 @@
+import json
+import os
+import threading
+
+from .color_validation import DARK_COLOR_MODE, LIGHT_COLOR_MODE, to_hex
+from .logger import logger
+from .themes import (
+    chain_stat_keys,
+    get_theme_color_report,
+    get_theme_from_parsed,
+    list_theme_names,
+    read_theme_file,
+    theme_chain_state,
+    themes_dir,
+    user_themes_dir,
+)
+
+# === Manifest Paths ===
+this_script_dir = os.path.join(os.path.dirname(__file__), "..")
+manifest_path = os.path.join(this_script_dir, "user_files", "theme_manifest.json")
+MANIFEST_VERSION = 3
+
+DEFAULT_TAGLINE = "Balanced study palette"
+
+# Preview swatch -> (theme keys to try in order, fallback color).
+PREVIEW_SWATCHES = {
+    "canvas": (("CANVAS", "WINDOW_BG"), "#f5f5f5"),
+    "surface": (("CANVAS_ELEVATED", "FRAME_BG"), "#ffffff"),
+    "border": (("BORDER", "MEDIUM_BORDER"), "#c4c4c4"),
+    "fg": (("FG", "TEXT_FG"), "#111827"),
+    "subtle_fg": (("FG_SUBTLE", "FG_FAINT", "SLIGHTLY_GREY_TEXT"), "#6b7280"),
+    "primary": (("BUTTON_PRIMARY_BG", "BUTTON_FOCUS_BG"), "#3b82f6"),
+    "highlight": (("HIGHLIGHT_BG", "SELECTED_BG"), "#dbeafe"),
+}
+SWATCH_MODES = {LIGHT_COLOR_MODE: "light", DARK_COLOR_MODE: "dark"}
+
+# === Manifest State ===
+_manifest = None
+# The prewarm scheduler syncs the manifest on a background thread.
+_manifest_lock = threading.RLock()
+
+
+def _file_mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0
+
+
+def _chain_state(user_path: str, system_path: str) -> dict:
+    # Derived themes go stale when any base in their `extends` chain changes. The stats
+    # are stored so later runs can tell without reading and hashing the chain again.
+    try:
+        paths, chain_hash = theme_chain_state(user_path if os.path.exists(user_path) else system_path)
+    except (OSError, ValueError):
+        paths, chain_hash = [], ""
+    return {"chain_hash": chain_hash, "chain_paths": paths, "chain_stats": chain_stat_keys(paths)}
+
+
+def _entry_is_current(entry: dict, user_path: str, system_path: str) -> bool:
+    return (
+        entry.get("user_mtime") == _file_mtime(user_path)
+        and entry.get("system_mtime") == _file_mtime(system_path)
+        and entry.get("chain_stats") == chain_stat_keys(entry.get("chain_paths", []))
+    )
+
+
+def _theme_sources(theme_name: str) -> tuple:
+    return (
+        os.path.join(user_themes_dir, f"{theme_name}.json"),
+        os.path.join(themes_dir, f"{theme_name}.json"),
+    )
+
+
+# === Entry Construction ===
+def build_swatches(theme: dict) -> dict:
+    parsed_colors = get_theme_color_report(theme)["colors"]
+    swatches = {}
+    for mode, mode_name in SWATCH_MODES.items():
+        mode_swatches = {}
+        for swatch, (keys, fallback) in PREVIEW_SWATCHES.items():
+            mode_swatches[swatch] = fallback
+            for key in keys:
+                rgba = parsed_colors.get(key, {}).get(mode)
+                if rgba is not None:
+                    mode_swatches[swatch] = to_hex(rgba)
+                    break
+        swatches[mode_name] = mode_swatches
+    return swatches
+
+
+def build_manifest_entry(theme_name: str, user_path: str, system_path: str) -> dict:
+    user_theme = read_theme_file(user_path) if os.path.exists(user_path) else {}
+    system_theme = read_theme_file(system_path) if os.path.exists(system_path) else {}
+
+    def metadata(key: str, default: str) -> str:
+        return user_theme.get(key) or system_theme.get(key) or default
+
+    effective = user_theme or system_theme
+    return {
+        "display_name": metadata("name", theme_name),
+        "tagline": metadata("tagline", DEFAULT_TAGLINE),
+        "author": metadata("author", ""),
+        "user_mtime": _file_mtime(user_path),
+        "system_mtime": _file_mtime(system_path),
+        "swatches": build_swatches(get_theme_from_parsed(effective)),
+        **_chain_state(user_path, system_path),
+    }
+
+
+# === Manifest IO ===
+def _read_manifest() -> dict:
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"version": MANIFEST_VERSION, "themes": {}}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "themes": {}}
+    return manifest
+
+
+def _write_manifest(manifest: dict) -> None:
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def get_theme_manifest() -> dict:
+    """Return a copy of ``{theme name: entry}``, rebuilding only entries whose files changed."""
+    # A copy, since a background sync can add or drop entries while the GUI iterates.
+    with _manifest_lock:
+        return dict(_sync_manifest())
+
+
+def _sync_manifest() -> dict:
+    global _manifest
+    if _manifest is None:
+        _manifest = _read_manifest()
+    entries = _manifest["themes"]
+    theme_names = list_theme_names()
+    changed = False
+    for theme_name in theme_names:
+        user_path, system_path = _theme_sources(theme_name)
+        entry = entries.get(theme_name)
+        if entry is None or not _entry_is_current(entry, user_path, system_path):
+            try:
+                entries[theme_name] = build_manifest_entry(theme_name, user_path, system_path)
+            except (OSError, ValueError, KeyError, TypeError) as error:
+                logger.debug(f"Skipping theme {theme_name}: {error}")
+                continue
+            changed = True
+    for theme_name in [name for name in entries if name not in theme_names]:
+        del entries[theme_name]
+        changed = True
+    if changed:
+        _write_manifest(_manifest)
+    return entries
+
+
+def get_theme_manifest_entry(theme_name: str) -> dict:
+    return get_theme_manifest().get(theme_name, {})
@@ -1,7 +1,14 @@
+import copy
+import hashlib
 import json
 import os
+import re
 import shutil
 
+from .color_validation import format_color_errors, validate_theme_colors
+from .logger import logger
+from .perf import perf
+
 # === Path Configuration ===
 this_script_dir = os.path.join(os.path.dirname(__file__), "..")
 themes_dir = os.path.join(this_script_dir, "themes")
@@ -9,12 +16,24 @@ user_themes_dir = os.path.join(this_script_dir, "user_files", "themes")
 
 DEFAULT_THEME_NAME = "Anki"
 
+# === Validation Cache ===
+# Keyed by theme hash; values are validate_theme_colors() reports.
+COLOR_REPORT_CACHE_LIMIT = 64
+_color_reports = {}
+perf.add_gauge("cache_size/color_report", lambda: len(_color_reports))
+
 # === Theme IO ===
-def list_system_theme_names() -> list:
-    names = []
-    for filename in os.listdir(themes_dir):
-        if filename.lower().endswith(".json"):
-            names.append(filename[:-5])
+# Name listings keyed by the mtimes of both theme directories.
+_theme_names_cache = {}
+
+
+def _list_json_names(directory: str) -> list:
+    if not os.path.isdir(directory):
+        return []
+    return [filename[:-5] for filename in os.listdir(directory) if filename.lower().endswith(".json")]
+
+
+def _sort_theme_names(names) -> list:
     names = sorted(set(names))
     if DEFAULT_THEME_NAME in names:
         names.remove(DEFAULT_THEME_NAME)
@@ -22,8 +41,23 @@ def list_system_theme_names() -> list:
     return names
 
 
+def list_system_theme_names() -> list:
+    return _sort_theme_names(_list_json_names(themes_dir))
+
+
+def list_theme_names() -> list:
+    """System presets plus themes that only exist in user_files/themes."""
+    key = tuple(os.path.getmtime(d) if os.path.isdir(d) else 0 for d in (themes_dir, user_themes_dir))
+    cached = _theme_names_cache.get(key)
+    if cached is None:
+        cached = _sort_theme_names(_list_json_names(themes_dir) + _list_json_names(user_themes_dir))
+        _theme_names_cache.clear()
+        _theme_names_cache[key] = cached
+    return list(cached)
+
+
 def normalize_theme_name(theme_name: str = "") -> str:
-    available = list_system_theme_names()
+    available = list_theme_names()
     if not available:
         return DEFAULT_THEME_NAME
     if isinstance(theme_name, str) and theme_name.endswith(".json"):
@@ -37,7 +71,11 @@ def normalize_theme_name(theme_name: str = "") -> str:
 
 def get_system_theme_path(theme_name: str = "") -> str:
     normalized = normalize_theme_name(theme_name)
-    return os.path.join(themes_dir, f"{normalized}.json")
+    system_theme_path = os.path.join(themes_dir, f"{normalized}.json")
+    if not os.path.exists(system_theme_path):
+        # User-only themes are their own baseline.
+        return os.path.join(user_themes_dir, f"{normalized}.json")
+    return system_theme_path
 
 
 def get_user_theme_path(theme_name: str = "") -> str:
@@ -54,19 +92,283 @@ def ensure_user_theme(theme_name: str = "") -> str:
     return user_theme_path
 
 
+# === Theme Inheritance ===
+# A theme may declare ``"extends": "<theme name>"`` and list only the colors it overrides,
+# either as full entries or as ``[light, dark]`` pairs that keep the base entry's labels.
+# Raw files keyed by path and revalidated by (mtime, size): (stat key, content hash, parsed).
+_raw_theme_cache = {}
+# Flattened themes keyed by the content hashes of every file in the inheritance chain.
+RESOLVED_THEME_CACHE_LIMIT = 64
+_resolved_theme_cache = {}
+perf.add_gauge("cache_size/theme_resolution", lambda: len(_resolved_theme_cache))
+# Chain hashes keyed by path: (stat keys the hash was computed under, chain paths, hash).
+_chain_hash_cache = {}
+
+
+def _stat_key(path: str):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_raw_theme(path: str) -> tuple:
+    stat = os.stat(path)
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+    cached = _raw_theme_cache.get(path)
+    if cached is not None and cached[0] == stat_key:
+        return cached[1], cached[2]
+    with open(path, "rb") as f:
+        data = f.read()
+    content_hash = hashlib.sha1(data).hexdigest()
+    theme = json.loads(data.decode("utf-8"))
+    _raw_theme_cache[path] = (stat_key, content_hash, theme)
+    return content_hash, theme
+
+
+def _find_base_theme(base_name: str, directory: str, exclude: str = "") -> str:
+    # Bases resolve next to the extending file first, so user copies inherit user edits.
+    for base_dir in (directory, themes_dir, user_themes_dir):
+        base_path = os.path.join(base_dir, f"{base_name}.json")
+        if os.path.exists(base_path) and not _same_path(base_path, exclude):
+            return base_path
+    return ""
+
+
+def _same_path(a: str, b: str) -> bool:
+    return bool(a and b) and os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+
+def _theme_chain(path: str, seen: list = None, paths: list = None) -> list:
+    """[(content hash, raw theme)] from ``path`` down to its root base; ``paths`` collects the files."""
+    seen = list(seen or [])
+    chain = []
+    while path:
+        if any(_same_path(path, seen_path) for seen_path in seen):
+            names = [os.path.basename(p)[:-5] for p in seen + [path]]
+            raise ValueError(f"Theme inheritance cycle: {' -> '.join(names)}")
+        seen.append(path)
+        if paths is not None:
+            paths.append(path)
+        content_hash, theme = _read_raw_theme(path)
+        chain.append((content_hash, theme))
+        base_name = theme.get("extends")
+        if not base_name:
+            break
+        base_path = _find_base_theme(base_name, os.path.dirname(path), path)
+        if not base_path:
+            raise ValueError(f"{os.path.basename(path)}: base theme {base_name!r} not found")
+        path = base_path
+    return chain
+
+
+def _merge_theme(base: dict, derived: dict) -> dict:
+    merged = dict(base)
+    merged.update({key: value for key, value in derived.items() if key != "colors"})
+    colors = dict(base.get("colors", {}))
+    for key, entry in derived.get("colors", {}).items():
+        base_entry = colors.get(key)
+        if isinstance(entry, list) and len(entry) == 2 and base_entry and len(base_entry) > 3:
+            colors[key] = base_entry[:2] + entry + base_entry[4:]
+        else:
+            colors[key] = entry
+    merged["colors"] = colors
+    return merged
+
+
+def _flatten_chain(chain: list) -> dict:
+    cache_key = tuple(content_hash for content_hash, _ in chain)
+    resolved = _resolved_theme_cache.get(cache_key)
+    perf.count_cache("theme_resolution", resolved is not None)
+    if resolved is None:
+        resolved = {}
+        for _, theme in reversed(chain):
+            resolved = _merge_theme(resolved, theme)
+        if len(_resolved_theme_cache) >= RESOLVED_THEME_CACHE_LIMIT:
+            _resolved_theme_cache.clear()
+        _resolved_theme_cache[cache_key] = resolved
+    # Callers normalize and edit what they get back.
+    return copy.deepcopy(resolved)
+
+
+def _chain_stat_keys(paths: list) -> tuple:
+    # The directories are included because a new file there can change which base is found.
+    return tuple(_stat_key(path) for path in [themes_dir, user_themes_dir] + paths)
+
+
+def chain_stat_keys(paths: list) -> list:
+    """JSON friendly stat keys of the theme directories and ``paths``, for staleness checks across runs."""
+    return [list(key) if key else None for key in _chain_stat_keys(paths)]
+
+
+def theme_chain_state(path: str) -> tuple:
+    """(chain paths, chain hash) for ``path``, recomputed only when a file in the chain changes."""
+    cached = _chain_hash_cache.get(path)
+    if cached is not None and cached[0] == _chain_stat_keys(cached[1]):
+        return cached[1], cached[2]
+    paths = []
+    chain = _theme_chain(path, paths=paths)
+    chain_hash = hashlib.sha1("".join(content_hash for content_hash, _ in chain).encode("utf-8")).hexdigest()
+    _chain_hash_cache[path] = (_chain_stat_keys(paths), paths, chain_hash)
+    return paths, chain_hash
+
+
+def theme_chain_hash(path: str) -> str:
+    """Hash of every file in ``path``'s inheritance chain."""
+    return theme_chain_state(path)[1]
+
+
+def resolve_theme(theme: dict, path: str) -> dict:
+    """Flatten ``theme``, the possibly unsaved contents of ``path``, onto its base chain."""
+    base_name = theme.get("extends")
+    if not base_name:
+        return theme
+    base_path = _find_base_theme(base_name, os.path.dirname(path), path)
+    if not base_path:
+        raise ValueError(f"Base theme {base_name!r} not found")
+    return _merge_theme(_flatten_chain(_theme_chain(base_path, seen=[path])), theme)
+
+
+def compact_theme(theme: dict, path: str) -> dict:
+    """Drop color entries that only repeat what the theme's base already defines."""
+    if not theme.get("extends"):
+        return theme
+    base_colors = resolve_theme({"extends": theme["extends"]}, path).get("colors", {})
+    compact = dict(theme)
+    compact["colors"] = {}
+    for key, entry in theme.get("colors", {}).items():
+        base_entry = base_colors.get(key)
+        if entry == base_entry:
+            continue
+        if (
+            isinstance(entry, list) and isinstance(base_entry, list)
+            and len(entry) == len(base_entry) > 3
+            and entry[:2] == base_entry[:2] and entry[4:] == base_entry[4:]
+        ):
+            compact["colors"][key] = entry[2:4]
+        else:
+            compact["colors"][key] = entry
+    return compact
+
+
+def read_theme_file(path: str) -> dict:
+    return _flatten_chain(_theme_chain(path))
+
+
+@perf.timed("get_theme")
 def get_theme(theme_name: str = "") -> dict:
     user_theme_path = ensure_user_theme(theme_name)
-    themes_parsed = json.loads(open(user_theme_path, encoding="utf-8").read())
-    return get_theme_from_parsed(themes_parsed)
+    themes_parsed = get_theme_from_parsed(read_theme_file(user_theme_path))
+    report = get_theme_color_report(themes_parsed)
+    if report["errors"]:
+        logger.debug(f"{user_theme_path}:\n{format_color_errors(report['errors'])}")
+    return themes_parsed
 
 
 def get_system_theme(theme_name: str = "") -> dict:
     system_theme_path = get_system_theme_path(theme_name)
-    themes_parsed = json.loads(open(system_theme_path, encoding="utf-8").read())
-    return get_theme_from_parsed(themes_parsed)
+    return get_theme_from_parsed(read_theme_file(system_theme_path))
+
+
+def get_theme_hash(theme: dict) -> str:
+    serialized = json.dumps(theme.get("colors", {}), sort_keys=True)
+    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+
+def get_theme_color_report(theme: dict) -> dict:
+    theme_hash = get_theme_hash(theme)
+    report = _color_reports.get(theme_hash)
+    perf.count_cache("color_report", report is not None)
+    if report is None:
+        report = validate_theme_colors(theme.get("colors", {}))
+        if len(_color_reports) >= COLOR_REPORT_CACHE_LIMIT:
+            _color_reports.clear()
+        _color_reports[theme_hash] = report
+    return report
+
+
+# === Theme Text Validation ===
+def _find_span(text: str, key: str, value=None) -> tuple:
+    """(offset, length) of ``value`` inside the ``key`` entry, else of the key itself."""
+    match = re.search(r'"%s"\s*:' % re.escape(key), text)
+    if match is None:
+        return 0, 1
+    if isinstance(value, str):
+        value_offset = text.find(json.dumps(value), match.end())
+        if value_offset >= 0:
+            return value_offset, len(json.dumps(value))
+    return match.start(), len(key) + 2
+
+
+def validation_failure(offset: int, message: str) -> dict:
+    """A validate_theme_text() result with a single error and nothing to save."""
+    return {"theme": None, "resolved": None, "errors": [{"offset": offset, "length": 1, "message": message}], "warnings": []}
+
+
+def validate_theme_text(text: str, path: str) -> dict:
+    """Check an edited theme document that will be saved to ``path``.
+
+    Returns ``{"theme": parsed or None, "resolved": flattened or None, "errors": [...],
+    "warnings": [...]}``. Each issue is a dict with ``offset``, ``length`` and ``message``.
+    Errors block saving; warnings are color values that will fall back at load time.
+    """
+    try:
+        theme = json.loads(text)
+    except ValueError as error:
+        return validation_failure(getattr(error, "pos", 0), str(error))
+    if not isinstance(theme, dict) or not isinstance(theme.get("colors"), dict):
+        return validation_failure(0, 'Expected an object with a "colors" object')
+    try:
+        resolved = resolve_theme(theme, path)
+    except (OSError, ValueError) as error:
+        return validation_failure(_find_span(text, "extends")[0], str(error))
+
+    errors = []
+    warnings = []
+    for error in validate_theme_colors(resolved["colors"])["errors"]:
+        offset, length = _find_span(text, error["key"], error["value"])
+        issue = {"offset": offset, "length": length, "message": format_color_errors([error])}
+        # Wrong types break the color pickers and CSS output, not just this one color.
+        if error["mode"] is None or not isinstance(error["value"], str):
+            errors.append(issue)
+        else:
+            warnings.append(issue)
+    # Normalizing is what get_theme() does at load time, so a theme that fails here
+    # would fail on every startup once saved.
+    try:
+        get_theme_from_parsed(copy.deepcopy(resolved))
+    except KeyError as error:
+        key = error.args[0]
+        offset, length = _find_span(text, "colors")
+        errors.append({"offset": offset, "length": length, "message": f'Missing required color "{key}"'})
+    except (IndexError, TypeError, AttributeError) as error:
+        offset, length = _find_span(text, "colors")
+        errors.append({"offset": offset, "length": length, "message": f"Theme cannot be loaded: {error}"})
+    if errors:
+        return {"theme": None, "resolved": None, "errors": errors, "warnings": warnings}
+    return {"theme": theme, "resolved": resolved, "errors": errors, "warnings": warnings}
+
+
+def diff_theme(saved: dict, edited: dict) -> dict:
+    """Keys that differ between two theme documents, split into colors and other keys."""
+    saved_colors = saved.get("colors", {})
+    edited_colors = edited.get("colors", {})
+    return {
+        "colors": [key for key, entry in edited_colors.items() if saved_colors.get(key) != entry],
+        "removed_colors": [key for key in saved_colors if key not in edited_colors],
+        "other": [
+            key for key in set(saved) | set(edited)
+            if key != "colors" and saved.get(key) != edited.get(key)
+        ],
+    }
 
 
 def write_theme(file, theme_content):
+    try:
+        theme_content = compact_theme(theme_content, file)
+    except (OSError, ValueError) as error:
+        logger.debug(f"Writing {file} without compaction: {error}")
     with open(file, "w", encoding="utf-8") as f:
         json.dump(theme_content, f, indent=2, sort_keys=True)
 
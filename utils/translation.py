@@ -7,14 +7,18 @@ translation_dir = os.path.join(this_script_dir, 'translation')
 
 # === Loaders ===
 def get_texts_dict() -> dict:
-    texts = {}
+    global texts
+    if texts is not None:
+        return texts
+    loaded = {}
     for file in os.listdir(translation_dir):
         if "json" in file:
             file = file.replace(".json", "")
-            if texts.get(file, "") == "":
+            if loaded.get(file, "") == "":
                 texts_path = os.path.join(translation_dir, file+'.json')
-                texts_parsed = json.loads(open(texts_path, encoding='utf-8').read())
-                texts[file] = texts_parsed
+                with open(texts_path, encoding='utf-8') as f:
+                    loaded[file] = json.load(f)
+    texts = loaded
     return texts
 
 # === Accessors ===
@@ -23,4 +27,5 @@ def get_texts(lang: str) -> dict:
     return texts.get(lang, texts["en_US"])
 
 # === Module Cache ===
-texts = get_texts_dict()
+# Loaded on first use (or by the prewarm scheduler) and kept for the process lifetime.
+texts = None